@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
-from teeiq.data_utils import clean_teetimes
 from teeiq.analytics import kpis
 from teeiq.demo import make_demo_teetimes
+from teeiq.session import current_teetimes, use_course, use_frame
 
 st.set_page_config(page_title="TeeIQ – Run your course like a hedge fund", page_icon="⛳", layout="wide")
 
@@ -27,22 +27,27 @@ with st.sidebar:
     st.caption("Upload a tee times CSV or generate demo data.")
     tee_file = st.file_uploader("tee_times.csv", type=["csv"])
     if st.button("Generate demo data"):
-        st.session_state["tee_df"] = make_demo_teetimes()
-
-if tee_file is not None:
-    st.session_state["tee_df"] = pd.read_csv(tee_file)
-
-df_raw = st.session_state.get("tee_df", pd.DataFrame())
-
-if df_raw.empty:
-    st.warning("Upload a tee times CSV in the sidebar or click 'Generate demo data'.")
+        use_frame(make_demo_teetimes())
+    st.caption("Or open a saved course (shared with everyone viewing it).")
+    saved_id = st.text_input("Saved course ID", value=st.session_state.get("course_id", ""))
+    if st.button("Open saved course") and saved_id:
+        use_course(saved_id)
+
+# Only a newly uploaded file replaces the session's data; otherwise a CSV left in the uploader
+# would override "Open saved course" on every rerun.
+if tee_file is not None and st.session_state.get("tee_file_id") != tee_file.file_id:
+    st.session_state["tee_file_id"] = tee_file.file_id
+    use_frame(pd.read_csv(tee_file))
+
+try:
+    df = current_teetimes()
+except Exception as e:
+    st.error(f"Data error: {e}")
+    st.stop()
+
+if df.empty:
+    st.warning("Upload a tee times CSV in the sidebar, click 'Generate demo data', or open a saved course.")
 else:
-    try:
-        df = clean_teetimes(df_raw)
-    except Exception as e:
-        st.error(f"Data error: {e}")
-        st.stop()
-
     total, booked, util, revenue, potential = kpis(df)
     c1, c2, c3, c4 = st.columns(4)
     with c1: st.container(border=False).markdown(f'<div class="kpi-card"><div class="metric-label">Total Slots</div><h3>{total:,}</h3></div>', unsafe_allow_html=True)
@@ -1,6 +1,8 @@
 import streamlit as st
 from teeiq.import_ui import import_flow
 from teeiq.persistence import save_teetimes
+from teeiq.cache import refresh_course
+from teeiq.session import use_course
 
 st.header("Import & Save (Bulletproof Loader)")
 
@@ -14,4 +16,6 @@ if not tee_df.empty:
     st.success(f"Imported {len(tee_df):,} rows.")
     if course_id and st.button("Save to database"):
         save_teetimes(tee_df, course_id)
-        st.success("Saved to DB.")
+        refresh_course(course_id, dates=tee_df["date"].unique())
+        use_course(course_id)
+        st.success("Saved to DB. This session now shows the saved course.")
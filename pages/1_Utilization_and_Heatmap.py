@@ -1,15 +1,14 @@
 import streamlit as st, numpy as np, matplotlib.pyplot as plt
-from teeiq.data_utils import clean_teetimes
+from teeiq.session import current_teetimes
 from teeiq.analytics import utilization_matrix, daily_utilization
 
 st.header("Utilization & Heatmap")
 
-if "tee_df" not in st.session_state or st.session_state["tee_df"].empty:
+df = current_teetimes()
+if df.empty:
     st.info("Load tee times on the main page first.")
     st.stop()
 
-df = clean_teetimes(st.session_state["tee_df"])
-
 # Heatmap with pretty 12-hour labels and value annotations
 mat = utilization_matrix(df)
 hours = list(mat.columns)
@@ -1,24 +1,33 @@
 import streamlit as st
 from datetime import date, timedelta
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
-from teeiq.data_utils import clean_teetimes, add_time_bins, fmt_time_ampm
-from teeiq.model import train_model, expected_utilization
-from teeiq.weather import fetch_daily_weather
+from teeiq.session import current_teetimes, job_status
+from teeiq.jobs import DONE, data_key, get_queue
+from teeiq.data_utils import (
+    minute_aggregate, rollup_slots, fmt_time_ampm, fmt_times_ampm, fmt_percent, fmt_money,
+)
+from teeiq.model import train_model, forecast_utilization
+from teeiq.features import feature_matrix
+from teeiq.weather import cached_daily_weather
+from teeiq.pricing import (
+    PRICE_MOMENTS, add_price_moments, elasticity_from_moments, suggest_prices, simulate_scenarios,
+)
 from teeiq.geo import geocode_address
+from teeiq.cache import course_model
+from teeiq.pace import pace_curves, pace_status
 
 
 st.header("Pricing & AI (Combined)")
 
 
 # ---------- Data gate ----------
-if "tee_df" not in st.session_state or st.session_state["tee_df"].empty:
+df = current_teetimes()
+if df.empty:
     st.info("Load tee times on the main page first.")
     st.stop()
 
-df = clean_teetimes(st.session_state["tee_df"])
-
 
 # ---------- Location & Weather ----------
 with st.expander("Location & Weather (type the street address)"):
@@ -65,17 +74,26 @@ with st.expander("Location & Weather (type the street address)"):
     st.caption("Tip: For TPC Sawgrass, the clubhouse area is roughly 30.19924, -81.39402.")
 
     if st.button("Fetch weather (optional)"):
+        st.session_state["weather_range"] = (lat, lon, start.isoformat(), end.isoformat())
+
+    # Re-read on every rerun (memoized) so the weather-keyed model job keeps the same inputs
+    # after it finishes and the page reruns
+    if "weather_range" in st.session_state:
         try:
-            weather_df = fetch_daily_weather(lat, lon, start.isoformat(), end.isoformat())
+            weather_df = cached_daily_weather(*st.session_state["weather_range"])
             if weather_df is not None and not weather_df.empty:
                 st.caption("Weather preview")
                 st.dataframe(weather_df.head(), use_container_width=True)
             else:
+                weather_df = None
                 st.info("No weather rows for that range. Continuing without weather.")
         except Exception as e:
+            st.session_state.pop("weather_range", None)
+            weather_df = None
             st.warning(f"Weather fetch failed: {e}. Continuing without weather.")
-    else:
-        weather_df = None
+        if st.button("Stop using weather"):
+            st.session_state.pop("weather_range", None)
+            st.rerun()
 
 
 # ---------- Tee-time interval + settings ----------
@@ -83,7 +101,7 @@ slot_minutes = st.selectbox(
     "Tee-time interval",
     options=[5, 7, 8, 9, 10, 12, 15],
     index=[5, 7, 8, 9, 10, 12, 15].index(10),
-    help="Choose the spacing between tee times. Pricing & AI will use this granularity.",
+    help="Choose the spacing between tee times. Switching re-buckets cached results; it doesn't retrain.",
 )
 
 top_n = st.slider(
@@ -103,92 +121,128 @@ target_util = st.slider(
     step=0.01,
 )
 
+use_forecast = st.checkbox(
+    "Forecast upcoming tee times (forecast start → end)",
+    value=True,
+    help="Score the upcoming days instead of averaging the tee times already in history.",
+)
 
-# ---------- Helper: compute low-fill blocks (always returns something if data exists) ----------
-def compute_low_fill_blocks(df_base: pd.DataFrame,
-                            weather_df: pd.DataFrame | None,
-                            slot_minutes: int,
-                            target: float,
-                            top_n: int) -> pd.DataFrame:
-    # Slot the tee times
-    tmp = add_time_bins(df_base, slot_minutes=slot_minutes)
 
-    # Aggregate by slot
-    grp = tmp.groupby(["weekday", "slot_index", "slot_label", "slot_hour", "slot_minute"]).agg(
-        slots=("booked", "size"),
-        booked=("booked", "sum"),
-        avg_price=("price", "mean"),
-    ).reset_index()
+# ---------- Minute-level aggregate; the model runs as a background job (interval/slider changes never retrain) ----------
+@st.cache_data(max_entries=16, show_spinner=False)
+def observed_minute_table(df_base: pd.DataFrame) -> pd.DataFrame:
+    # Per weekday x tee minute: slots, bookings, price sums and log-price moments
+    tmp = add_price_moments(df_base)
+    base = minute_aggregate(tmp, sum_cols=PRICE_MOMENTS)
+    base["p_sum"] = base["booked"].astype(float)
+    return base
+
+
+def build_minute_table(df_base: pd.DataFrame,
+                       observed: pd.DataFrame,
+                       weather_df: pd.DataFrame | None,
+                       forecast_start: date | None = None,
+                       forecast_days: int = 0,
+                       course_id: str | None = None,
+                       progress=None) -> pd.DataFrame:
+    # Runs on the job queue: expected bookings from the model where possible
+    base = observed.copy()
+    try:
+        if progress:
+            progress(0.1, "Training model")
+        # Saved courses share one process-wide model across sessions
+        if course_id and weather_df is None:
+            clf = course_model(course_id)
+        else:
+            clf = train_model(df_base, weather_df, course_id)
+        if progress:
+            progress(0.7, "Scoring tee times")
+        if forecast_days > 0:
+            fc = forecast_utilization(clf, df_base, weather_df, days=forecast_days, start=forecast_start)
+            p_mean = fc.groupby(["weekday", "minute_of_day"], observed=True)["p_book"].mean().reset_index()
+            base = base.merge(p_mean, on=["weekday", "minute_of_day"], how="left")
+        else:
+            X, _, meta = feature_matrix(df_base, weather_df, course_id=course_id)
+            scored = meta[["weekday", "minute_of_day"]].assign(p_book=clf.predict_proba(X)[:, 1])
+            p_mean = scored.groupby(["weekday", "minute_of_day"], observed=True)["p_book"].mean().reset_index()
+            base = base.merge(p_mean, on=["weekday", "minute_of_day"], how="left")
+        base["p_sum"] = (base["p_book"] * base["slots"]).fillna(base["p_sum"])
+        base = base.drop(columns="p_book")
+    except Exception:
+        pass
+    return base
+
+
+def minute_table(df_base: pd.DataFrame,
+                 weather_df: pd.DataFrame | None,
+                 forecast_start: date | None = None,
+                 forecast_days: int = 0) -> pd.DataFrame:
+    # Model-backed table once its job has finished (shared across sessions), observed bookings until then
+    course_id = st.session_state.get("course_id")
+    observed = observed_minute_table(df_base)
+    queue = get_queue()
+    job_id = queue.submit(
+        build_minute_table, df_base, observed, weather_df, forecast_start, forecast_days, course_id,
+        key=data_key("pricing-minutes", df_base, weather_df, forecast_start, forecast_days, course_id),
+    )
+    if job_status(job_id, "Training demand model")["status"] == DONE:
+        return queue.result(job_id)
+    st.caption("Showing observed utilization until the demand model finishes.")
+    return observed
+
 
-    # Drop empty-slot rows
+def slot_table(base: pd.DataFrame, slot_minutes: int) -> pd.DataFrame:
+    # Cheap roll-up of the minute table to the chosen interval
+    grp = rollup_slots(base, slot_minutes)
     grp = grp[grp["slots"] > 0].copy()
     if grp.empty:
         return grp  # no data
 
     grp["util"] = grp["booked"] / grp["slots"]
+    grp["expected_util"] = grp["p_sum"] / grp["slots"]
+    grp["elasticity"] = elasticity_from_moments(grp)
+    return grp
 
-    # Predict expected utilization with model if possible
-    try:
-        clf = train_model(df_base, weather_df, slot_minutes=slot_minutes)
-        util_pred = expected_utilization(clf, df_base, weather_df, slot_minutes=slot_minutes)
-        grp = grp.merge(
-            util_pred[
-                ["weekday", "slot_index", "slot_label", "slot_hour", "slot_minute", "expected_util"]
-            ],
-            on=["weekday", "slot_index", "slot_label", "slot_hour", "slot_minute"],
-            how="left",
-        )
-        grp["expected_util"] = grp["expected_util"].fillna(grp["util"])
-    except Exception:
-        grp["expected_util"] = grp["util"]
 
-    # Sort by expected utilization (lowest first)
+# ---------- Helper: compute low-fill blocks (always returns something if data exists) ----------
+def compute_low_fill_blocks(base: pd.DataFrame,
+                            slot_minutes: int,
+                            target: float,
+                            top_n: int) -> pd.DataFrame:
+    grp = slot_table(base, slot_minutes)
+    if grp.empty:
+        return grp  # no data
+
+    # Sort by expected utilization (lowest first) and take the bottom N blocks
     grp = grp.sort_values(["expected_util", "weekday", "slot_index"]).reset_index(drop=True)
+    grp = grp.head(top_n)
 
-    # Take the bottom N blocks
-    grp = grp.head(top_n).copy()
+    # Pricing logic: revenue-maximizing discount from per-slot price elasticity
+    return suggest_prices(grp, util_col="expected_util", target=target)
 
-    # Pricing logic: more aggressive discount for softer slots
-    gap = (target - grp["expected_util"]).clip(lower=0)
-    grp["suggested_discount"] = (0.10 + 0.20 * (gap / target)).clip(upper=0.35)
-    grp["new_price"] = grp["avg_price"] * (1 - grp["suggested_discount"])
 
-    return grp
+base = minute_table(df, weather_df, start, (end - start).days + 1 if use_forecast else 0)
 
 
-# ---------- Button: generate suggestions ----------
+# ---------- Button: generate suggestions (kept on screen while the model job finishes) ----------
 if st.button("Generate pricing suggestions"):
-    low_df = compute_low_fill_blocks(df, weather_df, slot_minutes, target_util, top_n)
+    st.session_state["show_suggestions"] = True
+
+if st.session_state.get("show_suggestions"):
+    low_df = compute_low_fill_blocks(base, slot_minutes, target_util, top_n)
 
     if low_df.empty:
         st.info("No tee-time data found to analyze.")
     else:
-        # Pretty formatting
-        pretty = low_df.copy()
-        pretty = pretty.rename(columns={"weekday": "Weekday"})
-        pretty["Time"] = pretty.apply(
-            lambda r: fmt_time_ampm(int(r["slot_hour"]), int(r["slot_minute"])),
-            axis=1,
-        )
-        pretty["Expected Utilization"] = (
-            pretty["expected_util"] * 100
-        ).map(lambda x: f"{x:.2f}%")
-        pretty["Average Price"] = pretty["avg_price"].map(lambda x: f"${x:.2f}")
-        pretty["Suggested Discount"] = (pretty["suggested_discount"] * 100).map(
-            lambda x: f"{x:.2f}%"
-        )
-        pretty["New Price"] = pretty["new_price"].map(lambda x: f"${x:.2f}")
-
-        pretty = pretty[
-            [
-                "Weekday",
-                "Time",
-                "Expected Utilization",
-                "Average Price",
-                "Suggested Discount",
-                "New Price",
-            ]
-        ]
+        # Display formatting is vectorized and only applied here; exports stay numeric
+        pretty = pd.DataFrame({
+            "Weekday": low_df["weekday"],
+            "Time": fmt_times_ampm(low_df["slot_hour"], low_df["slot_minute"]),
+            "Expected Utilization": fmt_percent(low_df["expected_util"]),
+            "Average Price": fmt_money(low_df["avg_price"]),
+            "Suggested Discount": fmt_percent(low_df["suggested_discount"]),
+            "New Price": fmt_money(low_df["new_price"]),
+        })
 
         # Top single recommendation
         top = low_df.iloc[0]
@@ -204,20 +258,23 @@ if st.button("Generate pricing suggestions"):
         st.caption("Lowest-utilization blocks to target with pricing and promotions.")
         st.dataframe(pretty, use_container_width=True)
 
-        # CSV download
+        # CSV download (numbers, not display strings, so spreadsheets/BI tools can use it)
+        csv_cols = [
+            "weekday", "slot_label", "slot_hour", "slot_minute", "slots", "expected_util",
+            "avg_price", "elasticity", "suggested_discount", "new_price", "projected_util",
+        ]
         st.download_button(
             "Download all suggestions (CSV)",
-            data=pretty.to_csv(index=False).encode(),
+            data=low_df[csv_cols].to_csv(index=False).encode(),
             file_name=f"teeiq_dynamic_pricing_{slot_minutes}min.csv",
             mime="text/csv",
         )
 
         # Simple bar chart of expected utilization
+        import matplotlib.pyplot as plt
+
         chart_df = low_df.copy()
-        chart_df["Time"] = chart_df.apply(
-            lambda r: fmt_time_ampm(int(r["slot_hour"]), int(r["slot_minute"])),
-            axis=1,
-        )
+        chart_df["Time"] = fmt_times_ampm(chart_df["slot_hour"], chart_df["slot_minute"])
         fig, ax = plt.subplots(figsize=(10, 3))
         ax.bar(chart_df["Time"], chart_df["expected_util"] * 100)
         ax.set_ylabel("Expected Utilization (%)")
@@ -228,3 +285,53 @@ if st.button("Generate pricing suggestions"):
         st.pyplot(fig, use_container_width=True)
 
 
+# ---------- What-if simulator: sweep many scenarios against the cached slot table ----------
+with st.expander("What-if simulator (sweep discounts and targets)"):
+    d_lo, d_hi = st.slider("Uniform discount range", 0.0, 0.35, (0.0, 0.35), 0.01)
+    t_lo, t_hi = st.slider("Target utilization range", 0.5, 0.95, (0.6, 0.9), 0.01)
+    n_scenarios = st.slider("Scenarios per sweep", 10, 500, 100, 10)
+
+    slots = slot_table(base, slot_minutes)
+    if slots.empty:
+        st.info("No tee-time data found to simulate.")
+    else:
+        sims = simulate_scenarios(
+            slots,
+            discounts=np.linspace(d_lo, d_hi, n_scenarios),
+            targets=np.linspace(t_lo, t_hi, n_scenarios),
+        )
+        s1, s2 = st.columns(2)
+        with s1:
+            st.caption("Uniform discount → projected revenue / utilization")
+            by_disc = sims[sims["kind"] == "discount"].set_index("value")
+            st.line_chart(by_disc[["revenue"]])
+            st.line_chart(by_disc[["projected_util"]])
+        with s2:
+            st.caption("Target utilization (optimized prices) → projected revenue / utilization")
+            by_target = sims[sims["kind"] == "target"].set_index("value")
+            st.line_chart(by_target[["revenue"]])
+            st.line_chart(by_target[["projected_util"]])
+        best = sims.loc[sims["revenue"].idxmax()]
+        st.markdown(
+            f"**Best scenario:** {best['kind']} = {best['value']:.2f} → "
+            f"projected utilization {best['projected_util']*100:.1f}%, "
+            f"revenue ${best['revenue']:,.0f} ({best['revenue_lift']:+,.0f} vs. current prices)"
+        )
+
+
+# ---------- Booking pace: upcoming slots filling slower than usual ----------
+if "booked_at" in df.columns and df["booked_at"].notna().any():
+    with st.expander("Booking pace (upcoming tee times vs. typical fill by lead time)"):
+        now = pd.Timestamp.now()
+        curves = pace_curves(df[df["tee_time"] < now], slot_minutes=slot_minutes)
+        status = pace_status(curves, df, as_of=now, slot_minutes=slot_minutes)
+        behind = status[status["behind"]]
+        if behind.empty:
+            st.info("No upcoming blocks are behind their usual booking pace.")
+        else:
+            st.caption("Upcoming blocks booking slower than usual at this lead time — candidates for repricing.")
+            st.dataframe(
+                behind[["date", "weekday", "slot_label", "lead_days", "slots", "booked_now", "expected_now", "pace_ratio"]]
+                .round({"lead_days": 1, "expected_now": 2, "pace_ratio": 2}),
+                use_container_width=True,
+            )
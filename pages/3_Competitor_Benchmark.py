@@ -1,21 +1,72 @@
 import streamlit as st
 import pandas as pd
 
-st.header("Competitor Benchmark (quick manual entry)")
-st.caption("Enter nearby courses and their typical weekday/weekend rates to see positioning.")
+from teeiq.benchmark import latest_rates, own_rates, positioning, positioning_summary, portfolio_positioning
+from teeiq.persistence import load_rival_rates, save_rival_rates
+from teeiq.session import current_teetimes
+
+st.header("Competitor Benchmark")
+st.caption(
+    "Enter nearby courses' rates by day (Weekday, Weekend, All or a day name) and optionally hour. "
+    "Your side comes from your tee-sheet prices."
+)
+
+course_id = st.text_input("Course ID", value=st.session_state.get("course_id", ""))
 
 default = pd.DataFrame({
-    "Course": ["You (weekday)","You (weekend)","Rival A (weekday)","Rival A (weekend)","Rival B (weekday)","Rival B (weekend)"],
-    "Rate":   [55, 75, 55, 75, 49, 69],
+    "rival": ["Rival A", "Rival A", "Rival B", "Rival B"],
+    "weekday": ["Weekday", "Weekend", "Weekday", "Weekend"],
+    "hour": [None, None, None, None],
+    "rate": [55.0, 75.0, 49.0, 69.0],
 })
-edited = st.data_editor(default, num_rows="dynamic", use_container_width=True)
+# Start from the latest saved rate per rival/day/hour; the defaults are only for new courses
+saved = load_rival_rates([course_id]) if course_id else pd.DataFrame()
+if not saved.empty:
+    saved["hour"] = pd.to_numeric(saved["hour"], errors="coerce")
+    default = (
+        saved.sort_values("observed_at")
+        .drop_duplicates(["rival", "weekday", "hour"], keep="last")[list(default.columns)]
+        .sort_values(["rival", "weekday"])
+        .reset_index(drop=True)
+    )
+edited = st.data_editor(
+    default,
+    num_rows="dynamic",
+    use_container_width=True,
+    column_config={
+        "weekday": st.column_config.TextColumn("Day", help="Weekday, Weekend, All, or Monday…Sunday"),
+        "hour": st.column_config.NumberColumn("Hour (blank = all day)", min_value=0, max_value=23, step=1),
+        "rate": st.column_config.NumberColumn("Rate", min_value=0.0, format="$%.2f"),
+    },
+)
+
+if st.button("Save rival rates") and course_id:
+    save_rival_rates(edited, course_id)
+    st.success(f"Saved {len(edited)} rival rates for {course_id}.")
+
+df = current_teetimes()
+if df.empty:
+    st.info("Load tee times on the main page to compare against your own prices.")
+else:
+    cid = course_id or ""
+    pos = positioning(own_rates(df.assign(course_id=cid)), latest_rates(edited.assign(course_id=cid)))
+    summary = positioning_summary(pos)
+    if summary.empty:
+        st.caption("Add at least one rival rate to compute positioning.")
+    else:
+        for _, r in summary.iterrows():
+            st.write(
+                f"**{r['day_type']}:** you ${r['our_rate']:.2f} vs rivals ${r['rival_rate']:.2f} "
+                f"→ Δ {r['delta']:+.2f} ({r['delta_pct']*100:+.1f}%)"
+            )
+        st.dataframe(pos.drop(columns="course_id").round(2), use_container_width=True)
 
-try:
-    you_wd = float(edited.loc[edited["Course"]=="You (weekday)","Rate"].iloc[0])
-    you_we = float(edited.loc[edited["Course"]=="You (weekend)","Rate"].iloc[0])
-    rivals = edited[~edited["Course"].str.startswith("You")]["Rate"].astype(float)
-    wd_rivals = rivals.iloc[::2].mean() if len(rivals)>=1 else float("nan")
-    we_rivals = rivals.iloc[1::2].mean() if len(rivals)>=2 else float("nan")
-    st.write(f"**Positioning:** Weekday Δ vs rivals: {you_wd - wd_rivals:+.2f}, Weekend Δ: {you_we - we_rivals:+.2f}")
-except Exception:
-    st.caption("Add at least two rival rates to compute positioning.")
+st.subheader("Portfolio positioning")
+portfolio = st.text_input("Saved course IDs (comma-separated)")
+if st.button("Compare portfolio") and portfolio:
+    ids = [c.strip() for c in portfolio.split(",") if c.strip()]
+    _, port_summary = portfolio_positioning(ids)
+    if port_summary.empty:
+        st.info("No saved tee times and rival rates found for those courses.")
+    else:
+        st.dataframe(port_summary.round(3), use_container_width=True)
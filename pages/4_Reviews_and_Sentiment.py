@@ -1,5 +1,7 @@
-import os, requests, pandas as pd, streamlit as st
+import os, pandas as pd, streamlit as st
 from teeiq.reviews import summarize_reviews
+from teeiq.jobs import DONE, data_key, get_queue
+from teeiq.session import job_status
 
 st.header("Reviews & Sentiment")
 
@@ -8,8 +10,12 @@ st.caption("To auto-pull Google reviews, add a free SERPAPI key to your environm
 course = st.text_input("Course name")
 town = st.text_input("Town/City + State (e.g., 'Ponte Vedra Beach, FL')")
 serp_key = os.getenv("SERPAPI_KEY", "")
+# Fetched reviews are reused across sessions for this long before the query is fetched again
+REVIEWS_MAX_AGE = 6 * 3600
+
+def fetch_google_reviews_with_serpapi(query: str, api_key: str, progress=None) -> pd.DataFrame:
+    import requests
 
-def fetch_google_reviews_with_serpapi(query: str, api_key: str) -> pd.DataFrame:
     # Find place
     s = requests.get(
         "https://serpapi.com/search.json",
@@ -23,6 +29,8 @@ def fetch_google_reviews_with_serpapi(query: str, api_key: str) -> pd.DataFrame:
     place_id = results[0].get("place_id")
     if not place_id:
         return pd.DataFrame()
+    if progress:
+        progress(0.5, "Fetching reviews")
 
     # Pull reviews
     r = requests.get(
@@ -45,13 +53,27 @@ with col1:
         elif not serp_key:
             st.error("No SERPAPI_KEY set. Get a free key at serpapi.com and set it in your environment.")
         else:
-            try:
-                q = f"{course} {town}"
-                reviews_df = fetch_google_reviews_with_serpapi(q, serp_key)
-                if reviews_df.empty:
-                    st.info("No reviews returned for that query.")
-            except Exception as e:
-                st.error(f"SERPAPI error: {e}")
+            # Runs in the background; results are reused across sessions for the same query
+            q = f"{course} {town}"
+            st.session_state["reviews_query"] = q
+            st.session_state["reviews_job"] = get_queue().submit(
+                fetch_google_reviews_with_serpapi, q, serp_key,
+                key=data_key("serpapi-reviews", q), max_age=REVIEWS_MAX_AGE,
+            )
+
+    if "reviews_job" in st.session_state:
+        job = job_status(st.session_state["reviews_job"], "SERPAPI fetch")
+        if job["status"] == DONE:
+            reviews_df = get_queue().result(st.session_state["reviews_job"])
+            if reviews_df.empty:
+                st.info("No reviews returned for that query.")
+                if st.button("Fetch again"):
+                    q = st.session_state["reviews_query"]
+                    st.session_state["reviews_job"] = get_queue().submit(
+                        fetch_google_reviews_with_serpapi, q, serp_key,
+                        key=data_key("serpapi-reviews", q), force=True,
+                    )
+                    st.rerun()
 
 with col2:
     file = st.file_uploader("Or upload reviews CSV (review_date, rating, text)", type=["csv"])
@@ -4,9 +4,10 @@ from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 
-from teeiq.data_utils import clean_teetimes
-from teeiq.analytics import kpis, utilization_matrix, daily_utilization
-from teeiq.model import train_model, expected_utilization, dynamic_price_suggestion
+from teeiq.session import current_teetimes, current_series, job_status
+from teeiq.jobs import DONE, data_key, get_queue
+from teeiq.analytics import kpis, utilization_matrix
+from teeiq.data_utils import minute_aggregate, rollup_slots
 from teeiq.reports import make_advanced_weekly_pdf
 
 def hour_label(h: int) -> str:
@@ -18,12 +19,11 @@ st.header("Reports (Advanced PDF)")
 
 reports_dir = Path("reports"); reports_dir.mkdir(exist_ok=True)
 
-if "tee_df" not in st.session_state or st.session_state["tee_df"].empty:
+df = current_teetimes()
+if df.empty:
     st.info("Load tee times on the main page first.")
     st.stop()
 
-df = clean_teetimes(st.session_state["tee_df"])
-
 # Compute KPIs
 T,B,U,R,P = kpis(df)
 kpi_dict = {
@@ -33,16 +33,24 @@ kpi_dict = {
     "Potential (open)": f"${P:,.0f}",
 }
 
-# Week-over-week deltas (if enough history)
-trend = daily_utilization(df).sort_values("date")
+# Rolling windows, week-over-week and year-over-year (same weekdays)
+series = current_series(df)
+trend = series.daily_utilization()
+summary = series.summary()
 notes = [f"Week utilization: {U*100:.0f}%."]
-if len(trend) >= 14:
-    this_week = trend.tail(7)["util"].mean()
-    prev_week = trend.tail(14).head(7)["util"].mean()
-    delta = (this_week - prev_week)*100
-    notes.append(f"Week-over-week change: {delta:+.1f} pts.")
-else:
+if np.isnan(summary["wow_util_pts"]):
     notes.append("Not enough history for WoW comparison.")
+else:
+    notes.append(f"Week-over-week change: {summary['wow_util_pts']:+.1f} pts.")
+notes.append(
+    f"Last 28 days: {summary['util_28d']*100:.0f}% utilization, "
+    f"${summary['revenue_28d']:,.0f} revenue, {summary['pace_28d']:.0f} bookings/day."
+)
+if not np.isnan(summary["yoy_util_pts"]):
+    notes.append(
+        f"Year-over-year (same weekdays): {summary['yoy_util_pts']:+.1f} pts, "
+        f"revenue {summary['yoy_revenue_pct']:+.1f}%."
+    )
 
 # Heatmap data
 mat = utilization_matrix(df)
@@ -50,43 +58,81 @@ heatmap = mat.to_numpy()
 hm_ylabels = list(mat.index)
 hm_xlabels = [hour_label(h) for h in list(mat.columns)]
 
-# Top actions from predictive engine (no weather for PDF speed)
-try:
-    clf = train_model(df, None)
-    util_df = expected_utilization(clf, df, None)
-    recs = dynamic_price_suggestion(util_df).sort_values("expected_util").head(10)
-    top_rows = []
-    for _, r in recs.iterrows():
-        hour = int(r["hour"])
-        hh = hour % 12 or 12
-        ampm = "AM" if hour < 12 else "PM"
-        top_rows.append([
-            r["weekday"],
-            f"{hh}{ampm}",
-            f"{r['expected_util']*100:.0f}%",
-            f"{r['avg_price']:.2f}",
-            f"{r['new_price']:.2f}",
-            f"{(r['avg_price']-r['new_price'])*100:.0f}"
-        ])
-except Exception:
-    top_rows = []
+# Top actions from predictive engine (no weather for PDF speed); only built for the PDF,
+# so opening this page doesn't load scikit-learn or train a model.
+def top_actions(df):
+    from teeiq.model import dynamic_price_suggestion, expected_utilization, train_model
 
-if st.button("Generate advanced weekly PDF"):
-    fname = reports_dir / f"report_{datetime.now().date()}.pdf"
+    try:
+        clf = train_model(df, None)
+        util_df = expected_utilization(clf, df, None).merge(
+            rollup_slots(minute_aggregate(df), 10)[["weekday", "slot_index", "avg_price"]],
+            on=["weekday", "slot_index"],
+            how="left",
+        )
+        recs = dynamic_price_suggestion(util_df).sort_values("expected_util").head(10)
+        top_rows = []
+        for _, r in recs.iterrows():
+            hour = int(r["slot_hour"])
+            hh = hour % 12 or 12
+            ampm = "AM" if hour < 12 else "PM"
+            top_rows.append([
+                r["weekday"],
+                f"{hh}{ampm}",
+                f"{r['expected_util']*100:.0f}%",
+                f"{r['avg_price']:.2f}",
+                f"{r['new_price']:.2f}",
+                f"{(r['avg_price']-r['new_price'])*100:.0f}"
+            ])
+    except (ValueError, KeyError):  # too little history to train/score
+        top_rows = []
+    return top_rows
+
+def build_report(filename: str, df: pd.DataFrame, progress=None) -> str:
+    # Runs on the job queue so the page stays responsive and the PDF survives navigation
+    if progress:
+        progress(0.1, "Scoring top actions")
+    actions = top_actions(df)
+    if progress:
+        progress(0.7, "Rendering PDF")
     make_advanced_weekly_pdf(
-        filename=str(fname),
+        filename=filename,
         kpis=kpi_dict,
         trend_df=trend,
         heatmap=heatmap,
         heatmap_ylabels=hm_ylabels,
         heatmap_xlabels=hm_xlabels,
-        top_actions=top_rows,
+        top_actions=actions,
         notes=notes,
     )
-    with open(fname, "rb") as f:
-        pdf_bytes = f.read()
-    st.success(f"Saved {fname.name}")
-    st.download_button("Download report", data=pdf_bytes, file_name=fname.name, mime="application/pdf")
+    return filename
+
+
+def submit_report(force: bool = False):
+    today = datetime.now().date()
+    key = data_key("weekly-pdf", df, today)
+    # The data hash is in the name, so each finished job points at its own PDF (other courses,
+    # sessions or newer uploads on the same day never overwrite it)
+    fname = reports_dir / f"report_{today}_{key[:12]}.pdf"
+    st.session_state["report_job"] = get_queue().submit(build_report, str(fname), df, key=key, force=force)
+
+
+if st.button("Generate advanced weekly PDF"):
+    submit_report()
+
+if "report_job" in st.session_state:
+    job = job_status(st.session_state["report_job"], "Building PDF")
+    if job["status"] == DONE:
+        fname = Path(get_queue().result(st.session_state["report_job"]))
+        if fname.exists():
+            with open(fname, "rb") as f:
+                pdf_bytes = f.read()
+            st.success(f"Saved {fname.name}")
+            st.download_button("Download report", data=pdf_bytes, file_name=fname.name, mime="application/pdf")
+        else:
+            # The finished job's PDF was deleted: build it again instead of reusing the job
+            submit_report(force=True)
+            st.rerun()
 
 st.subheader("Existing reports")
 for p in sorted(reports_dir.glob("*.pdf")):
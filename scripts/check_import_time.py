@@ -0,0 +1,91 @@
+"""
+Import-time budget for the teeiq package.
+
+Each module is imported in a fresh interpreter with `python -X importtime`; the check fails
+if any of them pulls in a heavy dependency at import time (those must be imported inside the
+function that needs them) or takes longer than the budget.
+
+    python scripts/check_import_time.py            # default budget
+    python scripts/check_import_time.py --budget-ms 800 -v
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+MODULES = [
+    "teeiq",
+    "teeiq.data_utils",
+    "teeiq.analytics",
+    "teeiq.pricing",
+    "teeiq.recs",
+    "teeiq.model",
+    "teeiq.persistence",
+    "teeiq.cache",
+    "teeiq.timeseries",
+    "teeiq.pace",
+    "teeiq.jobs",
+    "teeiq.features",
+    "teeiq.export",
+    "teeiq.quality",
+    "teeiq.simulation",
+    "teeiq.benchmark",
+    "teeiq.reports",
+    "teeiq.weather",
+    "teeiq.geo",
+]
+# Top-level packages that only specific actions need (training, PDFs, HTTP, the database).
+HEAVY = ["sklearn", "scipy", "matplotlib", "reportlab", "sqlalchemy", "requests"]
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per imported module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--budget-ms", type=float, default=1000.0, help="max cumulative import time per module")
+    ap.add_argument("-v", "--verbose", action="store_true", help="list the slowest imports per module")
+    args = ap.parse_args()
+
+    failures = []
+    print(f"{'module':22} {'ms':>8}  heavy imports")
+    for module in MODULES:
+        profile = import_profile(module)
+        ms = profile.get(module, 0) / 1000
+        heavy = sorted({name.split(".")[0] for name in profile} & set(HEAVY))
+        print(f"{module:22} {ms:8.1f}  {', '.join(heavy) or '-'}")
+        if args.verbose:
+            for name, us in sorted(profile.items(), key=lambda kv: -kv[1])[1:6]:
+                print(f"{'':24}{us / 1000:8.1f}  {name}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} at import time")
+        if ms > args.budget_ms:
+            failures.append(f"{module} took {ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if failures:
+        print("\n" + "\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
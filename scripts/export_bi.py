@@ -0,0 +1,27 @@
+"""
+Export numeric slot aggregates, daily KPIs and price suggestions for saved courses (BI feed).
+
+Only days whose tee times changed since the last run are rewritten, so this is cheap to run nightly:
+
+    python scripts/export_bi.py --courses demo-course,other-course --out exports
+"""
+import argparse
+import os
+
+from teeiq.export import export_courses
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--courses", default=os.getenv("COURSE_IDS", "demo-course"), help="comma-separated course IDs")
+    ap.add_argument("--out", default="exports")
+    ap.add_argument("--slot-minutes", type=int, default=10)
+    ap.add_argument("--format", choices=["parquet", "csv"], default=None, help="default: parquet if pyarrow is installed")
+    args = ap.parse_args()
+
+    course_ids = [c.strip() for c in args.courses.split(",") if c.strip()]
+    print(export_courses(course_ids, args.out, args.slot_minutes, args.format).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
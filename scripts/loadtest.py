@@ -0,0 +1,68 @@
+"""
+Load-test the TeeIQ API and report p50/p99 latency per endpoint.
+
+    uvicorn teeiq.api:app --port 8000 &
+    python scripts/loadtest.py --url http://127.0.0.1:8000 --course demo-course -n 200 -c 16
+"""
+import argparse
+import time
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ENDPOINTS = [
+    "/courses/{cid}/kpis",
+    "/courses/{cid}/utilization",
+    "/courses/{cid}/low-fill",
+    "/courses/{cid}/prices",
+    "/courses/{cid}/fill-forecast",
+]
+
+
+def hit(url: str):
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=60) as r:
+            r.read()
+            ok = r.status == 200
+    except OSError:  # URLError/HTTPError, socket timeouts and connection resets
+        ok = False
+    return time.perf_counter() - t0, ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--course", default="demo-course")
+    ap.add_argument("-n", "--requests", type=int, default=200, help="requests per endpoint")
+    ap.add_argument("-c", "--concurrency", type=int, default=16)
+    args = ap.parse_args()
+
+    jobs = [
+        (ep, args.url.rstrip("/") + ep.format(cid=args.course))
+        for ep in ENDPOINTS
+        for _ in range(args.requests)
+    ]
+    # Warm the per-course caches once so the numbers reflect steady state.
+    for ep in ENDPOINTS:
+        hit(args.url.rstrip("/") + ep.format(cid=args.course))
+
+    latencies, errors = defaultdict(list), defaultdict(int)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for (ep, _), (secs, ok) in zip(jobs, pool.map(lambda j: hit(j[1]), jobs)):
+            latencies[ep].append(secs)
+            errors[ep] += not ok
+    wall = time.perf_counter() - t0
+
+    print(f"{'endpoint':32} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for ep in ENDPOINTS:
+        ms = np.array(latencies[ep]) * 1000
+        print(f"{ep:32} {np.percentile(ms, 50):8.1f} {np.percentile(ms, 99):8.1f} {errors[ep]:7d}")
+    print(f"{len(jobs)} requests in {wall:.1f}s ({len(jobs) / wall:.0f} req/s, concurrency {args.concurrency})")
+
+
+if __name__ == "__main__":
+    main()
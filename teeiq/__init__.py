@@ -0,0 +1,100 @@
+"""
+TeeIQ: tee-sheet analytics, pricing and forecasting.
+
+Public functions are loaded from their submodules on first attribute access, so
+`import teeiq` stays cheap and never pulls in Streamlit, scikit-learn or the database
+driver until something that needs them is used:
+
+    import teeiq
+    df = teeiq.clean_teetimes(raw)
+    total, booked, util, revenue, potential = teeiq.kpis(df)
+"""
+import importlib
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    # data_utils
+    "WEEK_ORDER": "data_utils",
+    "clean_teetimes": "data_utils",
+    "add_time_bins": "data_utils",
+    "minute_aggregate": "data_utils",
+    "rollup_slots": "data_utils",
+    "fmt_time_ampm": "data_utils",
+    "fmt_times_ampm": "data_utils",
+    "fmt_percent": "data_utils",
+    "fmt_money": "data_utils",
+    # import quality scan
+    "QualityScanner": "quality",
+    "ingest": "quality",
+    # analytics
+    "kpis": "analytics",
+    "utilization_matrix": "analytics",
+    "daily_utilization": "analytics",
+    # recs / pricing
+    "low_fill_opportunities": "recs",
+    "estimate_elasticity": "pricing",
+    "optimize_prices": "pricing",
+    "simulate_scenarios": "pricing",
+    "suggest_prices": "pricing",
+    # model
+    "train_model": "model",
+    "update_model": "model",
+    "expected_utilization": "model",
+    "forecast_utilization": "model",
+    "dynamic_price_suggestion": "model",
+    "forecast_price_suggestion": "model",
+    "feature_matrix": "features",
+    # time series, pace, benchmark
+    "DailySeries": "timeseries",
+    "KpiPartial": "streaming",
+    "streaming_kpis": "streaming",
+    "pace_curves": "pace",
+    "pace_status": "pace",
+    "positioning": "benchmark",
+    "portfolio_positioning": "benchmark",
+    # background jobs
+    "JobQueue": "jobs",
+    "get_queue": "jobs",
+    # BI export
+    "export_frame": "export",
+    "export_courses": "export",
+    # fill/revenue forecast
+    "fill_forecast": "simulation",
+    "batch_fill_forecasts": "simulation",
+    # persistence
+    "save_teetimes": "persistence",
+    "load_teetimes": "persistence",
+    "iter_teetimes": "persistence",
+    # vendor adapters, demo data, reviews, weather, reports
+    "from_lightspeed": "adapters",
+    "from_chronogolf": "adapters",
+    "from_golfnow": "adapters",
+    "make_demo_teetimes": "demo",
+    "summarize_reviews": "reviews",
+    "fetch_daily_weather": "weather",
+    "geocode_address": "geo",
+    "make_advanced_weekly_pdf": "reports",
+}
+
+_SUBMODULES = {
+    "adapters", "analytics", "api", "benchmark", "cache", "data_utils", "demo", "export", "features", "geo",
+    "import_ui", "jobs", "model", "pace", "persistence", "pricing", "quality", "recs", "reports", "reviews",
+    "session", "simulation", "streaming", "timeseries", "weather",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
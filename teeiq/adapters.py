@@ -2,31 +2,35 @@ import pandas as pd
 from .data_utils import clean_teetimes
 
 # Example CSV header mappings. Adjust as needed to match real exports.
-def from_lightspeed(df: pd.DataFrame) -> pd.DataFrame:
+# clean_kwargs (impute, strict) are passed through to clean_teetimes.
+def from_lightspeed(df: pd.DataFrame, **clean_kwargs) -> pd.DataFrame:
     mapping = {
         "Start Time": "tee_time",
         "Green Fee": "price",
         "Booked": "booked",
+        "Booked At": "booked_at",
     }
     tmp = df.rename(columns={k: v for k, v in mapping.items() if k in df.columns})
-    return clean_teetimes(tmp)
+    return clean_teetimes(tmp, **clean_kwargs)
 
-def from_chronogolf(df: pd.DataFrame) -> pd.DataFrame:
+def from_chronogolf(df: pd.DataFrame, **clean_kwargs) -> pd.DataFrame:
     mapping = {
         "time": "tee_time",
         "rate": "price",
         "is_booked": "booked",
+        "booked_at": "booked_at",
     }
     tmp = df.rename(columns={k: v for k, v in mapping.items() if k in df.columns})
-    return clean_teetimes(tmp)
+    return clean_teetimes(tmp, **clean_kwargs)
 
-def from_golfnow(df: pd.DataFrame) -> pd.DataFrame:
+def from_golfnow(df: pd.DataFrame, **clean_kwargs) -> pd.DataFrame:
     mapping = {
         "teeTime": "tee_time",
         "price": "price",
         "status": "booked",  # 'sold'/'open'
+        "bookedDate": "booked_at",
     }
     tmp = df.rename(columns={k: v for k, v in mapping.items() if k in df.columns})
     if "booked" in tmp.columns:
         tmp["booked"] = tmp["booked"].astype(str).str.lower().isin(["sold","1","true","yes"])
-    return clean_teetimes(tmp)
+    return clean_teetimes(tmp, **clean_kwargs)
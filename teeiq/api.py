@@ -0,0 +1,150 @@
+"""
+Headless JSON API over the analytics core.
+
+Run:  uvicorn teeiq.api:app --host 0.0.0.0 --port 8000
+Heavy pandas/scikit-learn work runs on a thread pool (TEEIQ_API_WORKERS, default 4)
+so the event loop keeps accepting requests while models train or score. Course
+frames and models come from the process-wide teeiq.cache.
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Query
+
+from .analytics import kpis, utilization_matrix
+from .cache import course_frame, course_model, refresh_course
+from .model import forecast_price_suggestion
+from .recs import low_fill_opportunities
+from .simulation import course_fill_forecast
+
+EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("TEEIQ_API_WORKERS", "4")))
+# Forecast grids scale with days (and simulations with draws x days); cap them so one request
+# can't exhaust a worker.
+MAX_FORECAST_DAYS = 60
+MAX_FORECAST_DRAWS = 20_000
+MAX_SLOT_MINUTES = 60
+
+app = FastAPI(title="TeeIQ API")
+
+
+def _course_frame(course_id: str) -> pd.DataFrame:
+    df = course_frame(course_id)
+    if df.empty:
+        raise HTTPException(status_code=404, detail=f"No tee times for course '{course_id}'.")
+    return df
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(EXECUTOR, fn, *args)
+
+
+def _kpis(course_id: str) -> dict:
+    total, booked, util, revenue, potential = kpis(_course_frame(course_id))
+    return {
+        "course_id": course_id,
+        "total": total,
+        "booked": booked,
+        "utilization": util,
+        "revenue": revenue,
+        "potential": potential,
+    }
+
+
+def _utilization(course_id: str) -> dict:
+    mat = utilization_matrix(_course_frame(course_id))
+    return {
+        "course_id": course_id,
+        "weekdays": [str(w) for w in mat.index],
+        "hours": [int(h) for h in mat.columns],
+        "util": json.loads(mat.to_json(orient="values")),
+    }
+
+
+def _low_fill(course_id: str, slot_minutes: int, util_threshold: float, min_slots: int) -> dict:
+    opp = low_fill_opportunities(
+        _course_frame(course_id),
+        util_threshold=util_threshold,
+        min_slots=min_slots,
+        slot_minutes=slot_minutes,
+    )
+    return {"course_id": course_id, "slot_minutes": slot_minutes, "opportunities": _records(opp)}
+
+
+def _prices(course_id: str, slot_minutes: int, days: int, target: float) -> dict:
+    df = _course_frame(course_id)
+    prices = forecast_price_suggestion(
+        course_model(course_id), df, days=days, slot_minutes=slot_minutes, target=target
+    )
+    return {"course_id": course_id, "slot_minutes": slot_minutes, "prices": _records(prices)}
+
+
+def _fill_forecast(course_id: str, days: int, target: float, draws: int) -> dict:
+    _course_frame(course_id)
+    daily, summary = course_fill_forecast(course_id, days=days, target=target, n_draws=draws)
+    return {
+        "course_id": course_id,
+        "target": target,
+        "draws": draws,
+        "summary": _records(summary)[0],
+        "daily": _records(daily),
+    }
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/courses/{course_id}/kpis")
+async def get_kpis(course_id: str):
+    return await _run(_kpis, course_id)
+
+
+@app.get("/courses/{course_id}/utilization")
+async def get_utilization(course_id: str):
+    return await _run(_utilization, course_id)
+
+
+@app.get("/courses/{course_id}/low-fill")
+async def get_low_fill(
+    course_id: str,
+    slot_minutes: int = Query(10, ge=1, le=MAX_SLOT_MINUTES),
+    util_threshold: float = Query(0.6, ge=0.0, le=1.0),
+    min_slots: int = Query(8, ge=1),
+):
+    return await _run(_low_fill, course_id, slot_minutes, util_threshold, min_slots)
+
+
+@app.get("/courses/{course_id}/prices")
+async def get_prices(
+    course_id: str,
+    slot_minutes: int = Query(10, ge=1, le=MAX_SLOT_MINUTES),
+    days: int = Query(7, ge=1, le=MAX_FORECAST_DAYS),
+    target: float = Query(0.75, ge=0.0, le=1.0),
+):
+    return await _run(_prices, course_id, slot_minutes, days, target)
+
+
+@app.get("/courses/{course_id}/fill-forecast")
+async def get_fill_forecast(
+    course_id: str,
+    days: int = Query(7, ge=1, le=MAX_FORECAST_DAYS),
+    target: float = Query(0.75, ge=0.0, le=1.0),
+    draws: int = Query(2000, ge=1, le=MAX_FORECAST_DRAWS),
+):
+    """Monte Carlo fill/revenue intervals (P10/P50/P90, chance of reaching target) per upcoming day."""
+    return await _run(_fill_forecast, course_id, days, target, draws)
+
+
+@app.post("/courses/{course_id}/refresh")
+async def refresh(course_id: str):
+    """Reload the course from persistence after new rows were saved (model updates incrementally)."""
+    df = await _run(refresh_course, course_id)
+    return {"course_id": course_id, "refreshed": True, "rows": len(df)}
@@ -0,0 +1,114 @@
+"""
+Competitor positioning: our tee-time prices vs. stored rival rates by weekday/hour.
+
+Rival rates can be entered per day ('Monday'...), per day type ('Weekday', 'Weekend')
+or for every day ('All'), either for a specific hour or all day (hour blank). Hour-specific
+rates win over all-day rates for the same rival. Everything is computed with joins, so one
+call positions a whole portfolio of courses.
+"""
+import numpy as np
+import pandas as pd
+
+from .data_utils import WEEK_ORDER, clean_teetimes
+from .persistence import load_rival_rates, load_teetimes_many
+
+_DAY_GROUPS = {
+    **{d.lower(): [d] for d in WEEK_ORDER},
+    "weekday": WEEK_ORDER[:5],
+    "weekend": WEEK_ORDER[5:],
+    "all": WEEK_ORDER,
+}
+DAY_MAP = pd.DataFrame(
+    [(k, d) for k, days in _DAY_GROUPS.items() for d in days], columns=["day_key", "weekday"]
+)
+POSITION_COLUMNS = [
+    "course_id", "weekday", "hour", "our_rate", "slots",
+    "rival_mean", "rival_min", "rival_max", "n_rivals", "delta", "delta_pct",
+]
+
+
+def latest_rates(rivals: pd.DataFrame) -> pd.DataFrame:
+    """Most recent observation per course/rival/day/hour, expanded to one row per weekday."""
+    r = rivals.copy()
+    r["day_key"] = r["weekday"].astype(str).str.strip().str.lower()
+    r["hour"] = pd.to_numeric(r["hour"], errors="coerce")
+    r["rate"] = pd.to_numeric(r["rate"], errors="coerce")
+    r = r.dropna(subset=["rate"])
+    if "observed_at" in r.columns:
+        r = r.sort_values("observed_at")
+    r = r.drop_duplicates(["course_id", "rival", "day_key", "hour"], keep="last")
+    # Specific days override day types, which override 'All'
+    r["specificity"] = np.select([r["day_key"] == "all", r["day_key"].isin(["weekday", "weekend"])], [0, 1], 2)
+    r = r.drop(columns="weekday").merge(DAY_MAP, on="day_key", how="inner")
+    r = r.sort_values("specificity").drop_duplicates(["course_id", "rival", "weekday", "hour"], keep="last")
+    return r[["course_id", "rival", "weekday", "hour", "rate"]]
+
+
+def own_rates(tee_df: pd.DataFrame) -> pd.DataFrame:
+    """Our average listed price per course/weekday/hour (tee_df needs course_id or is treated as one course)."""
+    df = tee_df if "course_id" in tee_df.columns else tee_df.assign(course_id="")
+    out = df.groupby(["course_id", "weekday", "hour"], observed=True).agg(
+        our_rate=("price", "mean"), slots=("price", "size")
+    ).reset_index()
+    out["weekday"] = out["weekday"].astype(str)
+    return out
+
+
+def positioning(own: pd.DataFrame, rivals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join own_rates() with latest_rates(): one row per course/weekday/hour with
+    our_rate, rival_mean/min/max, n_rivals, delta (ours - rival mean) and delta_pct.
+    """
+    keys = ["course_id", "weekday", "hour"]
+    by_hour = rivals.dropna(subset=["hour"]).astype({"hour": int})
+    all_day = rivals[rivals["hour"].isna()].drop(columns="hour")
+
+    slots = own[keys]
+    specific = slots.merge(by_hour, on=keys, how="inner")
+    general = slots.merge(all_day, on=["course_id", "weekday"], how="inner")
+    per_rival = pd.concat([general, specific]).drop_duplicates(keys + ["rival"], keep="last")
+
+    agg = per_rival.groupby(keys).agg(
+        rival_mean=("rate", "mean"),
+        rival_min=("rate", "min"),
+        rival_max=("rate", "max"),
+        n_rivals=("rival", "nunique"),
+    ).reset_index()
+    out = own.merge(agg, on=keys, how="left")
+    out["delta"] = out["our_rate"] - out["rival_mean"]
+    out["delta_pct"] = out["delta"] / out["rival_mean"]
+    out["weekday"] = pd.Categorical(out["weekday"], categories=WEEK_ORDER, ordered=True)
+    return out[POSITION_COLUMNS].sort_values(keys).reset_index(drop=True)
+
+
+def positioning_summary(pos: pd.DataFrame) -> pd.DataFrame:
+    """Slot-weighted positioning per course and day type (Weekday/Weekend)."""
+    cols = ["course_id", "day_type", "our_rate", "rival_rate", "delta", "delta_pct", "n_rivals"]
+    if pos.empty:
+        return pd.DataFrame(columns=cols)
+    p = pos.dropna(subset=["rival_mean"]).copy()
+    p["day_type"] = np.where(p["weekday"].astype(str).isin(WEEK_ORDER[5:]), "Weekend", "Weekday")
+    p["w_our"] = p["our_rate"] * p["slots"]
+    p["w_rival"] = p["rival_mean"] * p["slots"]
+    out = p.groupby(["course_id", "day_type"]).agg(
+        slots=("slots", "sum"), w_our=("w_our", "sum"), w_rival=("w_rival", "sum"), n_rivals=("n_rivals", "max")
+    ).reset_index()
+    out["our_rate"] = out["w_our"] / out["slots"]
+    out["rival_rate"] = out["w_rival"] / out["slots"]
+    out["delta"] = out["our_rate"] - out["rival_rate"]
+    out["delta_pct"] = out["delta"] / out["rival_rate"]
+    return out[cols]
+
+
+def portfolio_positioning(course_ids) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Positioning for several saved courses in one batch: (detail, summary)."""
+    course_ids = list(course_ids)
+    tee = load_teetimes_many(course_ids)
+    rivals = load_rival_rates(course_ids)
+    if tee.empty:
+        return pd.DataFrame(columns=POSITION_COLUMNS), positioning_summary(pd.DataFrame())
+    tee = pd.concat(
+        [clean_teetimes(g).assign(course_id=cid) for cid, g in tee.groupby("course_id")], ignore_index=True
+    )
+    pos = positioning(own_rates(tee), latest_rates(rivals))
+    return pos, positioning_summary(pos)
@@ -0,0 +1,144 @@
+"""
+Process-wide, course-keyed cache shared by every Streamlit session and API worker thread.
+
+Each course (tenant) gets its own LRU of entries with a byte budget; the least recently
+used course is evicted when more than `max_tenants` are cached. Cached values are shared,
+so treat them as read-only (copy before mutating).
+"""
+import copy
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .data_utils import clean_teetimes
+from .model import train_model, update_model
+from .persistence import load_teetimes
+from .timeseries import DailySeries
+
+
+def _sizeof(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class TenantCache:
+    def __init__(self, max_bytes_per_tenant: int = 256 * 2**20, max_tenants: int = 32):
+        self.max_bytes_per_tenant = max_bytes_per_tenant
+        self.max_tenants = max_tenants
+        self._tenants: OrderedDict[str, OrderedDict] = OrderedDict()
+        self._lock = threading.RLock()
+        self._build_locks: dict[tuple, threading.Lock] = {}
+
+    def get(self, tenant: str, key, default=None):
+        with self._lock:
+            entries = self._tenants.get(tenant)
+            if entries is None or key not in entries:
+                return default
+            self._tenants.move_to_end(tenant)
+            entries.move_to_end(key)
+            return entries[key][0]
+
+    def put(self, tenant: str, key, value):
+        nbytes = _sizeof(value)
+        with self._lock:
+            entries = self._tenants.setdefault(tenant, OrderedDict())
+            entries.pop(key, None)
+            if nbytes > self.max_bytes_per_tenant:
+                return value  # too big to cache; caller still gets the value
+            entries[key] = (value, nbytes)
+            self._tenants.move_to_end(tenant)
+            while sum(n for _, n in entries.values()) > self.max_bytes_per_tenant:
+                entries.popitem(last=False)
+            while len(self._tenants) > self.max_tenants:
+                self._tenants.popitem(last=False)
+        return value
+
+    def get_or_create(self, tenant: str, key, factory):
+        """Return the cached value, building it once even if many sessions ask at the same time."""
+        sentinel = object()
+        value = self.get(tenant, key, sentinel)
+        if value is not sentinel:
+            return value
+        with self._lock:
+            build_lock = self._build_locks.setdefault((tenant, key), threading.Lock())
+        with build_lock:
+            value = self.get(tenant, key, sentinel)
+            if value is sentinel:
+                value = self.put(tenant, key, factory())
+        return value
+
+    def invalidate(self, tenant: str, key=None):
+        with self._lock:
+            if key is None:
+                self._tenants.pop(tenant, None)
+            elif tenant in self._tenants:
+                self._tenants[tenant].pop(key, None)
+
+    def stats(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [
+                {"course_id": t, "entries": len(e), "bytes": sum(n for _, n in e.values())}
+                for t, e in self._tenants.items()
+            ]
+        return pd.DataFrame(rows, columns=["course_id", "entries", "bytes"])
+
+
+shared_cache = TenantCache(
+    max_bytes_per_tenant=int(os.getenv("TEEIQ_CACHE_MB_PER_COURSE", "256")) * 2**20,
+    max_tenants=int(os.getenv("TEEIQ_CACHE_COURSES", "32")),
+)
+
+
+def course_frame(course_id: str) -> pd.DataFrame:
+    """Cleaned tee times for a saved course (empty frame if none)."""
+    def build():
+        raw = load_teetimes(course_id)
+        return clean_teetimes(raw) if not raw.empty else raw
+    return shared_cache.get_or_create(course_id, "frame", build)
+
+
+def course_model(course_id: str):
+    return shared_cache.get_or_create(course_id, "model", lambda: train_model(course_frame(course_id), course_id=course_id))
+
+
+def course_series(course_id: str) -> DailySeries:
+    return shared_cache.get_or_create(course_id, "series", lambda: DailySeries.from_frame(course_frame(course_id)))
+
+
+def refresh_course(course_id: str, dates=None) -> pd.DataFrame:
+    """Reload a course after new rows were saved; a cached model and daily series are updated
+    incrementally (into new objects, since other sessions may be reading them).
+
+    `dates` are the days the saved batch touched, including corrected or back-filled earlier
+    days; those (and the latest day onward) are re-folded into the series. Without them the
+    series is rebuilt from the reloaded frame.
+    """
+    model = shared_cache.get(course_id, "model")
+    series = shared_cache.get(course_id, "series")
+    shared_cache.invalidate(course_id)
+    df = course_frame(course_id)
+    if df.empty:
+        return df
+    if model is not None:
+        shared_cache.put(course_id, "model", update_model(model, df, course_id=course_id))
+    if series is not None and series.end is not None:
+        if dates is None:
+            series = DailySeries.from_frame(df)
+        else:
+            touched = df["date"].isin(set(dates)) | (df["date"] >= series.end)
+            series = copy.deepcopy(series).update_from_frame(df[touched])
+        shared_cache.put(course_id, "series", series)
+    return df
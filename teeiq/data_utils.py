@@ -14,30 +14,49 @@ def coerce_bool(x):
     return False
 
 
-def ensure_datetime_col(df: pd.DataFrame) -> pd.DataFrame:
+def ensure_datetime_col(df: pd.DataFrame, strict: bool = True) -> pd.DataFrame:
+    """
+    Parse tee_time (or the first usable date/time column) with errors="coerce".
+
+    strict=False keeps an unparseable candidate column as all-NaT instead of raising, so a
+    chunk of bad rows can be quarantined (teeiq.quality) rather than abort an import.
+    """
+    unparsed = None
     for c in ["tee_time", "datetime", "start_time", "time", "date_time"]:
         if c in df.columns:
             df[c] = pd.to_datetime(df[c], errors="coerce")
             if df[c].notna().any():
                 df["tee_time"] = df[c]
                 return df
+            unparsed = df[c] if unparsed is None else unparsed
 
     date_cols = [c for c in df.columns if "date" in c.lower()]
     time_cols = [c for c in df.columns if "time" in c.lower()]
     if date_cols and time_cols:
-        df["tee_time"] = pd.to_datetime(
+        parsed = pd.to_datetime(
             df[date_cols[0]].astype(str) + " " + df[time_cols[0]].astype(str),
             errors="coerce",
         )
-        if df["tee_time"].notna().any():
+        if parsed.notna().any():
+            df["tee_time"] = parsed
             return df
+        unparsed = parsed if unparsed is None else unparsed
 
+    if not strict and unparsed is not None:
+        df["tee_time"] = unparsed
+        return df
     raise ValueError("No datetime column found. Include 'tee_time' or (date + time).")
 
 
-def clean_teetimes(df: pd.DataFrame) -> pd.DataFrame:
+def clean_teetimes(df: pd.DataFrame, impute: bool = True, strict: bool = True) -> pd.DataFrame:
+    """
+    Normalize a raw tee sheet: tee_time, price, booked (+ booked_at/lead_days), weekday, hour, date.
+
+    impute=False leaves missing prices as NaN, for callers that clean in chunks and impute once
+    over the whole file (see impute_prices); strict is passed to ensure_datetime_col.
+    """
     df = df.copy()
-    df = ensure_datetime_col(df)
+    df = ensure_datetime_col(df, strict=strict)
     df["price"] = pd.to_numeric(df.get("price", np.nan), errors="coerce")
 
     book_col = next(
@@ -46,19 +65,33 @@ def clean_teetimes(df: pd.DataFrame) -> pd.DataFrame:
     )
     df["booked"] = df[book_col].apply(coerce_bool) if book_col else False
 
+    # Optional booking timestamp (vendors that export it); only meaningful for booked slots
+    if "booked_at" in df.columns:
+        df["booked_at"] = pd.to_datetime(df["booked_at"], errors="coerce").where(df["booked"])
+        df["lead_days"] = (df["tee_time"] - df["booked_at"]).dt.total_seconds() / 86400
+
     df["weekday"] = pd.Categorical(
         df["tee_time"].dt.day_name(), categories=WEEK_ORDER, ordered=True
     )
     df["hour"] = df["tee_time"].dt.hour
     df["date"] = df["tee_time"].dt.date
 
-    if df["price"].isna().any():
-        grp_med = df.groupby(["weekday", "hour"])["price"].transform("median")
-        df["price"] = df["price"].fillna(grp_med).fillna(df["price"].median())
+    # Imputed prices are counted for the import quality report (teeiq.quality)
+    df.attrs["imputed_prices"] = int(df["price"].isna().sum())
+    if impute:
+        df = impute_prices(df)
 
     return df.sort_values("tee_time").reset_index(drop=True)
 
 
+def impute_prices(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill missing prices with the weekday x hour median, then the overall median."""
+    if df["price"].isna().any():
+        grp_med = df.groupby(["weekday", "hour"], observed=True)["price"].transform("median")
+        df["price"] = df["price"].fillna(grp_med).fillna(df["price"].median())
+    return df
+
+
 def add_time_bins(df: pd.DataFrame, slot_minutes: int = 10) -> pd.DataFrame:
     """Create N-minute slots (labels + indices) from tee_time."""
     df = df.copy()
@@ -81,8 +114,67 @@ def add_time_bins(df: pd.DataFrame, slot_minutes: int = 10) -> pd.DataFrame:
     return df
 
 
+def minute_aggregate(df: pd.DataFrame, sum_cols=()) -> pd.DataFrame:
+    """
+    Per weekday x minute-of-day totals: slots, booked, price_sum (+ sums of `sum_cols`).
+
+    This is the base every slot interval is rolled up from (see rollup_slots).
+    """
+    tmp = df[["booked", "price", *sum_cols]].copy()
+    tmp["weekday"] = pd.Categorical(df["tee_time"].dt.day_name(), categories=WEEK_ORDER, ordered=True)
+    tmp["minute_of_day"] = df["tee_time"].dt.hour * 60 + df["tee_time"].dt.minute
+    tmp["booked"] = tmp["booked"].astype(int)
+    aggs = {
+        "slots": ("booked", "size"),
+        "booked": ("booked", "sum"),
+        "price_sum": ("price", "sum"),
+        **{c: (c, "sum") for c in sum_cols},
+    }
+    return tmp.groupby(["weekday", "minute_of_day"], observed=True).agg(**aggs).reset_index()
+
+
+def rollup_slots(base: pd.DataFrame, slot_minutes: int = 10) -> pd.DataFrame:
+    """
+    Roll a minute_aggregate() table up to N-minute slots (any N, even if it doesn't divide an hour).
+
+    Returns: weekday, slot_index, slot_label, slot_hour, slot_minute, avg_price + every summed column.
+    """
+    tmp = base.copy()
+    tmp["slot_index"] = (tmp["minute_of_day"] // slot_minutes).astype(int)
+    sums = [c for c in tmp.columns if c not in {"weekday", "minute_of_day", "slot_index"}]
+    out = tmp.groupby(["weekday", "slot_index"], observed=True)[sums].sum().reset_index()
+
+    slot_start_min = out["slot_index"] * slot_minutes
+    out["slot_hour"] = (slot_start_min // 60).astype(int)
+    out["slot_minute"] = (slot_start_min % 60).astype(int)
+    out["slot_label"] = (
+        out["slot_hour"].astype(str).str.zfill(2) + ":" + out["slot_minute"].astype(str).str.zfill(2)
+    )
+    out["avg_price"] = out["price_sum"] / out["slots"]
+    return out
+
+
 def fmt_time_ampm(h: int, m: int) -> str:
     hh = h % 12 or 12
     ampm = "AM" if h < 12 else "PM"
     return f"{hh}:{m:02d}{ampm}"
 
+
+def fmt_times_ampm(hours, minutes) -> pd.Series:
+    """Vectorized fmt_time_ampm for whole columns (keeps the index of `hours`)."""
+    h = pd.Series(hours).astype(int)
+    m = pd.Series(minutes, index=h.index).astype(int)
+    hh = (h % 12).replace(0, 12)
+    return hh.astype(str) + ":" + m.astype(str).str.zfill(2) + np.where(h < 12, "AM", "PM")
+
+
+def fmt_percent(fractions, decimals: int = 2) -> pd.Series:
+    """0.1234 -> '12.34%' for a whole column; formatting happens in NumPy, not per-row lambdas."""
+    s = pd.Series(fractions)
+    return pd.Series(np.char.mod(f"%.{decimals}f%%", s.to_numpy(dtype=float) * 100), index=s.index)
+
+
+def fmt_money(values, decimals: int = 2) -> pd.Series:
+    """12.5 -> '$12.50' for a whole column."""
+    s = pd.Series(values)
+    return pd.Series(np.char.mod(f"$%.{decimals}f", s.to_numpy(dtype=float)), index=s.index)
@@ -4,6 +4,7 @@ import pandas as pd
 
 def make_demo_teetimes(days=21, slots_per_hour=4, hours=(6,18), seed=7):
     rng = np.random.default_rng(seed)
+    lead_rng = np.random.default_rng(seed + 1)
     start_date = (datetime.now() - timedelta(days=days//2)).date()
     rows = []
     for d in range(days):
@@ -18,5 +19,6 @@ def make_demo_teetimes(days=21, slots_per_hour=4, hours=(6,18), seed=7):
                 demand = 0.55 + 0.25*(hour in {8,9,10}) + 0.15*(hour in {15,16})
                 demand += 0.15 if tee_dt.weekday() >= 5 else 0
                 booked = rng.random() < max(0.05, min(0.95, demand))
-                rows.append({"tee_time": tee_dt, "price": round(price,2), "booked": booked, "holes": 18, "source": "public"})
+                booked_at = tee_dt - timedelta(days=lead_rng.exponential(4 if tee_dt.weekday() >= 5 else 2)) if booked else None
+                rows.append({"tee_time": tee_dt, "price": round(price,2), "booked": booked, "booked_at": booked_at, "holes": 18, "source": "public"})
     return pd.DataFrame(rows)
@@ -0,0 +1,193 @@
+"""
+Columnar export of numeric aggregates for BI tools, refreshed incrementally.
+
+Layout under `root` (Hive-style partitions, readable by DuckDB/Spark/Power BI folder sources):
+
+    slots/course_id=<id>/date=<YYYY-MM-DD>/part-0.parquet   per-day slot aggregates
+    kpis/course_id=<id>/part-0.parquet                      daily KPIs
+    prices/course_id=<id>/part-0.parquet                    price suggestions per weekday/slot
+    _manifest/<id>.json                                     per-day fingerprints of the source rows
+
+Each run fingerprints every source day (row count + sum of row hashes) and compares them with the
+manifest. Only days whose tee times changed get their slot partitions rewritten. Days that
+disappeared are deleted. KPIs are patched for the changed days only. Prices are recomputed only
+when something changed. Values are stored raw (fractions, dollars, hour/minute ints); display
+formatting belongs to the UI. Parquet needs pyarrow; without it, CSV is written instead.
+"""
+import importlib.util
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from .pricing import PRICE_MOMENTS, add_price_moments, elasticity_from_moments, suggest_prices
+from .data_utils import minute_aggregate, rollup_slots
+from .features import _safe_name
+
+SOURCE_COLUMNS = ["tee_time", "price", "booked"]
+SLOT_COLUMNS = [
+    "date", "weekday", "slot_index", "slot_hour", "slot_minute",
+    "slots", "booked", "util", "revenue", "potential", "avg_price",
+]
+KPI_COLUMNS = ["date", "slots", "booked", "util", "revenue", "potential"]
+PRICE_COLUMNS = [
+    "weekday", "slot_index", "slot_hour", "slot_minute", "slots", "booked", "util",
+    "avg_price", "elasticity", "suggested_discount", "new_price", "projected_util",
+]
+
+
+def default_format() -> str:
+    return "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+
+
+def day_fingerprints(df: pd.DataFrame) -> pd.Series:
+    """Per-date fingerprint of the source rows (order-insensitive), indexed by ISO date string."""
+    hashes = pd.util.hash_pandas_object(df[SOURCE_COLUMNS], index=False)
+    g = pd.DataFrame({"date": df["date"].astype(str), "h": hashes.to_numpy()}).groupby("date")["h"]
+    return g.size().astype(str) + "-" + g.sum().astype(str)
+
+
+def slot_aggregates(df: pd.DataFrame, slot_minutes: int = 10) -> pd.DataFrame:
+    """Per date x slot: slots, booked, util, revenue, potential and avg_price (all numeric)."""
+    booked = df["booked"].astype(bool)
+    minute_of_day = df["tee_time"].dt.hour * 60 + df["tee_time"].dt.minute
+    tmp = pd.DataFrame({
+        "date": df["date"].astype(str),
+        "weekday": df["tee_time"].dt.day_name(),
+        "slot_index": (minute_of_day // slot_minutes).astype(int),
+        "booked": booked.astype(int),
+        "revenue": df["price"].where(booked, 0.0),
+        "potential": df["price"].where(~booked, 0.0),
+        "price": df["price"],
+    })
+    out = tmp.groupby(["date", "weekday", "slot_index"]).agg(
+        slots=("booked", "size"),
+        booked=("booked", "sum"),
+        revenue=("revenue", "sum"),
+        potential=("potential", "sum"),
+        avg_price=("price", "mean"),
+    ).reset_index()
+    out["util"] = out["booked"] / out["slots"]
+    slot_start = out["slot_index"] * slot_minutes
+    out["slot_hour"] = slot_start // 60
+    out["slot_minute"] = slot_start % 60
+    return out[SLOT_COLUMNS]
+
+
+def daily_kpis(slots: pd.DataFrame) -> pd.DataFrame:
+    """Roll slot aggregates up to one KPI row per date."""
+    out = slots.groupby("date")[["slots", "booked", "revenue", "potential"]].sum().reset_index()
+    out["util"] = out["booked"] / out["slots"]
+    return out[KPI_COLUMNS]
+
+
+def price_table(df: pd.DataFrame, slot_minutes: int = 10, target: float = 0.75) -> pd.DataFrame:
+    """Elasticity-based price suggestion for every weekday/slot, from observed utilization."""
+    base = minute_aggregate(add_price_moments(df), sum_cols=PRICE_MOMENTS)
+    agg = rollup_slots(base, slot_minutes)
+    agg = agg[agg["slots"] > 0].copy()
+    agg["util"] = agg["booked"] / agg["slots"]
+    agg["elasticity"] = elasticity_from_moments(agg)
+    out = suggest_prices(agg, util_col="util", target=target)
+    out["weekday"] = out["weekday"].astype(str)
+    return out[PRICE_COLUMNS]
+
+
+def _write(df: pd.DataFrame, directory: Path, fmt: str):
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".part-0.{fmt}.tmp"
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    tmp.replace(directory / f"part-0.{fmt}")
+
+
+def _read(directory: Path, fmt: str) -> pd.DataFrame | None:
+    path = directory / f"part-0.{fmt}"
+    if not path.exists():
+        return None
+    return pd.read_parquet(path) if fmt == "parquet" else pd.read_csv(path)
+
+
+def export_frame(
+    df: pd.DataFrame,
+    course_id: str,
+    root: str | Path = "exports",
+    slot_minutes: int = 10,
+    fmt: str | None = None,
+) -> dict:
+    """
+    Incrementally export one course's cleaned tee times.
+
+    Returns counts: days, changed_days, removed_days, slot_rows written.
+    """
+    root, fmt = Path(root), fmt or default_format()
+    # course_id becomes a path segment: '/' or '..' must not escape the export root
+    part = _safe_name(course_id)
+    manifest_path = root / "_manifest" / f"{part}.json"
+    slot_dir = root / "slots" / f"course_id={part}"
+    kpi_dir = root / "kpis" / f"course_id={part}"
+    price_dir = root / "prices" / f"course_id={part}"
+
+    old = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    if old.get("slot_minutes") != slot_minutes or old.get("format") != fmt:
+        # Layout changed: start this course over.
+        for d in (slot_dir, kpi_dir, price_dir):
+            shutil.rmtree(d, ignore_errors=True)
+        old = {}
+    old_days = old.get("days", {})
+
+    prints = day_fingerprints(df) if not df.empty else pd.Series(dtype=str)
+    new_days = prints.to_dict()
+    changed = [d for d, fp in new_days.items() if old_days.get(d) != fp]
+    removed = [d for d in old_days if d not in new_days]
+
+    for d in removed:
+        shutil.rmtree(slot_dir / f"date={d}", ignore_errors=True)
+
+    slots = pd.DataFrame(columns=SLOT_COLUMNS)
+    if changed:
+        subset = df[df["date"].astype(str).isin(changed)]
+        slots = slot_aggregates(subset, slot_minutes)
+        for d, part in slots.groupby("date"):
+            _write(part.drop(columns="date").reset_index(drop=True), slot_dir / f"date={d}", fmt)
+
+    if changed or removed:
+        # Patch daily KPIs for the touched days only.
+        kpis = _read(kpi_dir, fmt)
+        keep = kpis[~kpis["date"].astype(str).isin(changed + removed)] if kpis is not None else None
+        fresh = daily_kpis(slots) if changed else pd.DataFrame(columns=KPI_COLUMNS)
+        parts = [k for k in (keep, fresh) if k is not None and not k.empty]
+        kpis = pd.concat(parts, ignore_index=True) if parts else None
+        if kpis is None:
+            shutil.rmtree(kpi_dir, ignore_errors=True)
+            shutil.rmtree(price_dir, ignore_errors=True)
+        else:
+            kpis["date"] = kpis["date"].astype(str)
+            _write(kpis.sort_values("date").reset_index(drop=True), kpi_dir, fmt)
+            _write(price_table(df, slot_minutes), price_dir, fmt)
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({"slot_minutes": slot_minutes, "format": fmt, "days": new_days}))
+    return {
+        "course_id": course_id,
+        "days": len(new_days),
+        "changed_days": len(changed),
+        "removed_days": len(removed),
+        "slot_rows": len(slots),
+    }
+
+
+def export_courses(
+    course_ids,
+    root: str | Path = "exports",
+    slot_minutes: int = 10,
+    fmt: str | None = None,
+) -> pd.DataFrame:
+    """Export every saved course (see export_frame); one summary row per course."""
+    from .cache import course_frame
+
+    rows = [export_frame(course_frame(cid), cid, root, slot_minutes, fmt) for cid in course_ids]
+    return pd.DataFrame(rows, columns=["course_id", "days", "changed_days", "removed_days", "slot_rows"])
@@ -0,0 +1,119 @@
+"""
+Memory-mapped feature store for model training and scoring.
+
+featurize() output is written once per course and data version (a hash of the tee times,
+weather and feature list) as float32/int .npy files under TEEIQ_FEATURE_DIR, then memory-mapped
+copy-on-write (scikit-learn needs writable buffers but never writes). Repeated train/score
+calls - and every worker process on the machine - read the same pages instead of re-merging weather and re-running ffill/bfill. The matrices don't
+depend on the tee-time interval; slot columns for any interval are derived from minute_of_day
+when the meta frame is read.
+"""
+import os
+import shutil
+import uuid
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from .data_utils import WEEK_ORDER
+from .jobs import data_key
+
+FEATURE_DIR = os.getenv("TEEIQ_FEATURE_DIR", "features")
+KEEP_VERSIONS = 3
+# Stored per row alongside X/y (int32, date as days since epoch); slot_* columns are rebuilt per interval on read.
+META_COLUMNS = ["date", "weekday", "hour", "minute_of_day"]
+
+
+def feature_version(tee_df: pd.DataFrame, weather_df=None) -> str:
+    """Data hash a stored feature set is valid for."""
+    from .model import FEATURES
+
+    cols = [c for c in ("tee_time", "price", "booked") if c in tee_df.columns]
+    weather = weather_df if isinstance(weather_df, pd.DataFrame) and not weather_df.empty else None
+    return data_key(FEATURES, tee_df[cols], weather)[:16]
+
+
+def _safe_name(course_id: str) -> str:
+    """
+    course_id as a single path segment: percent-encoded (injective, so distinct ids never share a
+    directory; Hive readers decode it back), and never '.' or '..'.
+    """
+    name = quote(str(course_id), safe="")
+    # quote() never emits a bare "%", so "%-" (empty id) cannot collide either
+    return name if name.strip(".") else name.replace(".", "%2E") or "%-"
+
+
+def _write(path: Path, X: pd.DataFrame, y: pd.Series, meta: pd.DataFrame):
+    # Write to a temp dir and rename, so concurrent readers never see a partial version.
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp.mkdir(parents=True)
+    np.save(tmp / "X.npy", np.ascontiguousarray(X.to_numpy(dtype=np.float32)))
+    np.save(tmp / "y.npy", y.to_numpy(dtype=np.int8))
+    days = pd.to_datetime(meta["date"]).to_numpy("datetime64[D]").astype(np.int32)
+    weekday = pd.Categorical(meta["weekday"].astype(str), categories=WEEK_ORDER).codes
+    columns = {"date": days, "weekday": weekday, "hour": meta["hour"], "minute_of_day": meta["minute_of_day"]}
+    np.save(tmp / "meta.npy", np.column_stack([columns[c] for c in META_COLUMNS]).astype(np.int32))
+    try:
+        os.rename(tmp, path)
+    except OSError:  # another process stored the same version first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _prune(course_dir: Path, keep: int):
+    versions = sorted((p for p in course_dir.iterdir() if not p.name.startswith(".")), key=lambda p: p.stat().st_mtime)
+    for old in versions[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def meta_frame(meta: np.ndarray, slot_minutes: int = 10) -> pd.DataFrame:
+    """Meta columns from a stored int matrix, with slot columns for `slot_minutes`."""
+    minute_of_day = meta[:, 3]
+    slot_index = minute_of_day // slot_minutes
+    slot_start = slot_index * slot_minutes
+    out = pd.DataFrame({
+        "date": meta[:, 0].astype("datetime64[D]").astype(object),
+        "weekday": pd.Categorical.from_codes(meta[:, 1], categories=WEEK_ORDER, ordered=True),
+        "hour": meta[:, 2],
+        "minute_of_day": minute_of_day,
+        "slot_index": slot_index,
+        "slot_hour": slot_start // 60,
+        "slot_minute": slot_start % 60,
+    })
+    out["slot_label"] = (
+        out["slot_hour"].astype(str).str.zfill(2) + ":" + out["slot_minute"].astype(str).str.zfill(2)
+    )
+    return out
+
+
+def feature_matrix(
+    tee_df: pd.DataFrame,
+    weather_df=None,
+    slot_minutes: int = 10,
+    course_id: str | None = None,
+    root: str | os.PathLike = FEATURE_DIR,
+    keep: int = KEEP_VERSIONS,
+):
+    """
+    (X, y, meta) for training/scoring: X float32 (rows x FEATURES), y int8, meta DataFrame.
+
+    With a course_id the arrays are memory maps from the store (written on first use,
+    keeping the newest `keep` versions per course); without one they are built in memory.
+    """
+    from .model import featurize
+
+    if course_id is None:
+        X, y, meta = featurize(tee_df, weather_df, slot_minutes=slot_minutes)
+        return X.to_numpy(dtype=np.float32), y.to_numpy(dtype=np.int8), meta
+
+    course_dir = Path(root) / _safe_name(course_id)
+    path = course_dir / feature_version(tee_df, weather_df)
+    if not path.exists():
+        X, y, meta = featurize(tee_df, weather_df, slot_minutes=slot_minutes)
+        _write(path, X, y, meta)
+        _prune(course_dir, keep)
+    X = np.load(path / "X.npy", mmap_mode="c")
+    y = np.load(path / "y.npy", mmap_mode="c")
+    meta = meta_frame(np.load(path / "meta.npy", mmap_mode="c"), slot_minutes)
+    return X, y, meta
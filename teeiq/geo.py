@@ -1,4 +1,3 @@
-import requests
 from functools import lru_cache
 
 # Known-course hardcoded fallbacks (feel free to add more)
@@ -28,6 +27,8 @@ def geocode_address(address: str):
         return KNOWN_COURSE_COORDS[key]
 
     # 2) Open-Meteo Geocoding
+    import requests
+
     try:
         r = requests.get(OPEN_METEO_GEOCODE, params={"name": address, "count": 1}, timeout=15)
         r.raise_for_status()
@@ -1,7 +1,12 @@
+import itertools
+
 import streamlit as st
 import pandas as pd
 from . import adapters
 from .data_utils import clean_teetimes
+from .quality import ingest
+
+CHUNK_ROWS = 100_000
 
 VENDORS = {
     "Generic/Manual": None,
@@ -10,14 +15,38 @@ VENDORS = {
     "GolfNow": adapters.from_golfnow,
 }
 
-def mapping_widget(df: pd.DataFrame) -> pd.DataFrame:
+def column_mapping(df: pd.DataFrame) -> dict:
     st.write("### Map Your Columns")
     cols = list(df.columns)
     tee_col = st.selectbox("Which column = tee_time?", cols, key="map_tee")
     price_col = st.selectbox("Which column = price?", cols, key="map_price")
     booked_col = st.selectbox("Which column = booked?", cols, key="map_booked")
-    tmp = df.rename(columns={tee_col: "tee_time", price_col: "price", booked_col: "booked"})
-    return clean_teetimes(tmp)
+    booked_at_col = st.selectbox("Which column = booked at? (optional)", ["(none)"] + cols, key="map_booked_at")
+    mapping = {tee_col: "tee_time", price_col: "price", booked_col: "booked"}
+    if booked_at_col != "(none)":
+        mapping[booked_at_col] = "booked_at"
+    return mapping
+
+def mapping_widget(df: pd.DataFrame) -> pd.DataFrame:
+    return clean_teetimes(df.rename(columns=column_mapping(df)))
+
+def quality_panel(report, quarantined: pd.DataFrame):
+    if report.quarantined:
+        st.warning(f"Quarantined {report.quarantined:,} of {report.rows:,} rows (not imported).")
+    with st.expander("Data quality report", expanded=bool(report.quarantined)):
+        st.dataframe(report.summary(), use_container_width=True)
+        if report.partial_days:
+            st.caption("Partially covered days: " + ", ".join(str(d) for d in report.partial_days[:20]))
+        if not report.flagged.empty:
+            st.caption("Flagged rows (kept; sample)")
+            st.dataframe(report.flagged, use_container_width=True)
+        if not quarantined.empty:
+            st.download_button(
+                "Download quarantined rows (CSV)",
+                data=quarantined.to_csv(index=False).encode(),
+                file_name=f"quarantine_{report.source or 'import'}.csv",
+                mime="text/csv",
+            )
 
 def import_flow() -> pd.DataFrame:
     st.subheader("Import Tee Sheet")
@@ -26,15 +55,38 @@ def import_flow() -> pd.DataFrame:
     if not file:
         st.info("Upload a CSV to continue.")
         return pd.DataFrame()
-    raw = pd.read_csv(file)
+    # Chunked read: cleaning and the quality scan run per chunk in a single pass. Only the first
+    # raw chunk is read up front (adapter probe, column mapping); the rest stream into ingest.
+    reader = pd.read_csv(file, chunksize=CHUNK_ROWS)
+    first = next(reader, None)
+    if first is None or first.empty:
+        st.info("That CSV has no rows.")
+        return pd.DataFrame()
 
-    if VENDORS[vendor] is not None:
+    adapter = VENDORS[vendor]
+    if adapter is not None:
         try:
-            df = VENDORS[vendor](raw)
+            adapter(first.head(100))
             st.success(f"Imported using {vendor} adapter.")
-            return df
         except Exception as e:
             st.warning(f"Adapter failed: {e}. Falling back to manual mapping.")
+            adapter = None
+
+    if adapter is None:
+        # Manual mapping fallback
+        mapping = column_mapping(first)
+
+        def adapter(chunk: pd.DataFrame, **clean_kwargs) -> pd.DataFrame:
+            return clean_teetimes(chunk.rename(columns=mapping), **clean_kwargs)
 
-    # Manual mapping fallback
-    return mapping_widget(raw)
+    # Bad tee times reach the scanner as NaT and are quarantined; prices are imputed over the whole file
+    def convert(chunk: pd.DataFrame) -> pd.DataFrame:
+        return adapter(chunk, impute=False, strict=False)
+
+    try:
+        df, quarantined, report = ingest(itertools.chain([first], reader), convert, source=file.name)
+    except Exception as e:
+        st.error(f"Import failed: {e}")
+        return pd.DataFrame()
+    quality_panel(report, quarantined)
+    return df
@@ -1,12 +0,0 @@
-__all__ = [
-    "data_utils",
-    "analytics",
-    "recs",
-    "reviews",
-    "demo",
-    "adapters",
-    "import_ui",
-    "weather",
-    "model",
-    "persistence",
-]
@@ -0,0 +1,236 @@
+"""
+Local background jobs for long-running actions (model training, PDF builds, review fetches).
+
+Jobs run on a thread (or process) pool. Their status, progress and pickled result live in a
+small SQLite table, so any session - or a later process - can poll a job id and reuse a
+finished result instead of recomputing it. Submitting with a `key` that already has a
+queued, running or finished job returns that job; failed jobs are retried on the next submit.
+
+Every queue heartbeats the unfinished jobs it submitted. A queued/running job from another
+process (boot token) whose heartbeat has gone quiet for STALE_AFTER seconds is failed, so a
+restart can't leave a key polling forever - even when the new process reuses the old PID.
+"""
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+JOBS_DB = os.getenv("TEEIQ_JOBS_DB", "teeiq_jobs.db")
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+STATUS_COLUMNS = ["id", "name", "key", "status", "progress", "message", "error", "created_at", "updated_at"]
+# Identifies this process's jobs; PIDs are reused across container restarts.
+BOOT = uuid.uuid4().hex
+HEARTBEAT_SECONDS = 5.0
+STALE_AFTER = 30.0
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _update(db_path: str, job_id: str, **fields):
+    fields["updated_at"] = time.time()
+    cols = ", ".join(f"{k} = ?" for k in fields)
+    with _connect(db_path) as conn:
+        conn.execute(f"UPDATE jobs SET {cols} WHERE id = ?", [*fields.values(), job_id])
+
+
+def _accepts_progress(fn) -> bool:
+    try:
+        return "progress" in inspect.signature(fn).parameters
+    except (TypeError, ValueError):  # some builtins have no signature
+        return False
+
+
+def data_key(*parts) -> str:
+    """Stable hash of job inputs; DataFrames/Series are hashed by content."""
+    h = hashlib.sha1()
+    for p in parts:
+        if isinstance(p, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(p, index=False).to_numpy().tobytes())
+            h.update(repr(list(p.columns) if isinstance(p, pd.DataFrame) else p.name).encode())
+        else:
+            h.update(repr(p).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class JobProgress:
+    """Callable passed to job functions as `progress(fraction, message="")`; picklable for process pools."""
+
+    def __init__(self, db_path: str, job_id: str):
+        self.db_path = db_path
+        self.job_id = job_id
+
+    def __call__(self, fraction: float, message: str = ""):
+        _update(self.db_path, self.job_id, progress=float(min(max(fraction, 0.0), 1.0)), message=message)
+
+
+def _run(db_path: str, job_id: str, fn, args, kwargs):
+    _update(db_path, job_id, status=RUNNING, message="Running")
+    try:
+        result = fn(*args, **kwargs)
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        _update(db_path, job_id, status=FAILED, error=f"{type(e).__name__}: {e}", message="Failed")
+        return
+    _update(db_path, job_id, status=DONE, progress=1.0, message="Done", result=blob)
+
+
+@lru_cache(maxsize=64)
+def _load_result(db_path: str, job_id: str):
+    # Only finished jobs are loaded, and their results never change.
+    with _connect(db_path) as conn:
+        row = conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return pickle.loads(row[0])
+
+
+class JobQueue:
+    def __init__(self, db_path: str = JOBS_DB, workers: int = 2, processes: bool = False):
+        self.db_path = db_path
+        self.processes = processes
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self._pool = executor(max_workers=workers)
+        self._lock = threading.Lock()
+        with _connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, name TEXT, key TEXT, status TEXT, "
+                "progress REAL, message TEXT, result BLOB, error TEXT, pid INTEGER, "
+                "created_at REAL, updated_at REAL, boot TEXT, heartbeat_at REAL)"
+            )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for col, sql_type in (("boot", "TEXT"), ("heartbeat_at", "REAL")):
+                if col not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {sql_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key)")
+            self._fail_stale(conn)
+        threading.Thread(target=self._heartbeat, name="teeiq-jobs-heartbeat", daemon=True).start()
+
+    def _heartbeat(self):
+        while True:
+            with _connect(self.db_path) as conn:
+                conn.execute(
+                    "UPDATE jobs SET heartbeat_at = ? WHERE boot = ? AND status IN (?, ?)",
+                    (time.time(), BOOT, QUEUED, RUNNING),
+                )
+            time.sleep(HEARTBEAT_SECONDS)
+
+    @staticmethod
+    def _fail_stale(conn: sqlite3.Connection, job_id: str | None = None):
+        # Unfinished jobs of a process that stopped heartbeating can never finish; fail them so they are retried.
+        sql = (
+            "UPDATE jobs SET status = ?, error = ?, message = ? WHERE status IN (?, ?) "
+            "AND (boot IS NULL OR boot != ?) AND COALESCE(heartbeat_at, updated_at) < ?"
+        )
+        params = [FAILED, "Interrupted: worker process exited", "Failed", QUEUED, RUNNING, BOOT, time.time() - STALE_AFTER]
+        if job_id is not None:
+            sql += " AND id = ?"
+            params.append(job_id)
+        conn.execute(sql, params)
+
+    def submit(
+        self,
+        fn,
+        *args,
+        key: str | None = None,
+        name: str | None = None,
+        max_age: float | None = None,
+        force: bool = False,
+        **kwargs,
+    ) -> str:
+        """
+        Queue fn(*args, **kwargs) and return its job id. If fn accepts a `progress` argument it
+        gets a JobProgress. With `key`, an existing queued/running/done job for it is reused,
+        unless it finished more than `max_age` seconds ago or `force` is set.
+        """
+        name = name or getattr(fn, "__qualname__", repr(fn))
+        with self._lock:
+            if key is not None and not force:
+                row = self._find(key, max_age)
+                if row is not None:
+                    return row
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            with _connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT INTO jobs (id, name, key, status, progress, message, pid, created_at, updated_at, "
+                    "boot, heartbeat_at) VALUES (?, ?, ?, ?, 0, 'Queued', ?, ?, ?, ?, ?)",
+                    (job_id, name, key, QUEUED, os.getpid(), now, now, BOOT, now),
+                )
+        if _accepts_progress(fn):
+            kwargs["progress"] = JobProgress(self.db_path, job_id)
+        self._pool.submit(_run, self.db_path, job_id, fn, args, kwargs)
+        return job_id
+
+    def _find(self, key: str, max_age: float | None = None) -> str | None:
+        cutoff = 0.0 if max_age is None else time.time() - max_age
+        with _connect(self.db_path) as conn:
+            self._fail_stale(conn)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE key = ? AND status != ? AND NOT (status = ? AND updated_at < ?) "
+                "ORDER BY created_at DESC LIMIT 1",
+                (key, FAILED, DONE, cutoff),
+            ).fetchone()
+        return row[0] if row else None
+
+    def status(self, job_id: str) -> dict | None:
+        """id, name, key, status, progress (0-1), message, error and timestamps; None if unknown."""
+        query = f"SELECT {', '.join(STATUS_COLUMNS)}, boot FROM jobs WHERE id = ?"
+        with _connect(self.db_path) as conn:
+            row = conn.execute(query, (job_id,)).fetchone()
+            if row and row[3] in (QUEUED, RUNNING) and row[-1] != BOOT:
+                self._fail_stale(conn, job_id)
+                row = conn.execute(query, (job_id,)).fetchone()
+        return dict(zip(STATUS_COLUMNS, row)) if row else None
+
+    def result(self, job_id: str, default=None):
+        """A finished job's result (shared across sessions: treat as read-only), else `default`."""
+        job = self.status(job_id)
+        if job is None or job["status"] != DONE:
+            return default
+        return _load_result(self.db_path, job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None, poll: float = 0.2) -> dict | None:
+        """Block until the job is done or failed (or `timeout` seconds pass); returns its status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None or job["status"] in (DONE, FAILED):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll)
+
+    def jobs(self, limit: int = 50) -> pd.DataFrame:
+        """Most recent jobs, newest first."""
+        with _connect(self.db_path) as conn:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(STATUS_COLUMNS)} FROM jobs ORDER BY created_at DESC LIMIT ?",
+                conn,
+                params=(limit,),
+            )
+
+    def purge(self, older_than_days: float = 7.0) -> int:
+        """Delete finished/failed jobs (and their cached results) older than the cutoff."""
+        cutoff = time.time() - older_than_days * 86400
+        with _connect(self.db_path) as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            )
+        return cur.rowcount
+
+
+@lru_cache(maxsize=1)
+def get_queue() -> JobQueue:
+    """Process-wide queue shared by every Streamlit session (TEEIQ_JOB_WORKERS threads)."""
+    return JobQueue(JOBS_DB, workers=int(os.getenv("TEEIQ_JOB_WORKERS", "2")))
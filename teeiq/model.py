@@ -1,8 +1,20 @@
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING
+
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
 
-from .data_utils import add_time_bins
+if TYPE_CHECKING:  # scikit-learn is imported on first training, not at import time
+    from sklearn.ensemble import RandomForestClassifier
+
+from .data_utils import WEEK_ORDER, add_time_bins
+from .features import feature_matrix
+from .pricing import estimate_elasticity, suggest_prices
+
+# Interval-independent: one trained model serves every slot_minutes choice.
+FEATURES = ["minute_of_day", "is_weekend", "price", "temp_max", "precip"]
 
 
 def featurize(tee_df: pd.DataFrame, weather_df=None, slot_minutes: int = 10):
@@ -21,18 +33,17 @@ def featurize(tee_df: pd.DataFrame, weather_df=None, slot_minutes: int = 10):
         df["temp_max"] = np.nan
         df["precip"] = np.nan
 
-    minute_of_day = df["hour"] * 60 + df["tee_time"].dt.minute
+    df["minute_of_day"] = df["hour"] * 60 + df["tee_time"].dt.minute
 
     X = pd.DataFrame(
         {
-            "slot_index": df["slot_index"],
-            "minute_of_day": minute_of_day,
+            "minute_of_day": df["minute_of_day"],
             "is_weekend": df["is_weekend"].astype(int),
             "price": df["price"],
             "temp_max": df["temp_max"],
             "precip": df["precip"],
         }
-    ).fillna(method="ffill").fillna(method="bfill")
+    )[FEATURES].ffill().bfill()
 
     y = df["booked"].astype(int)
     meta = df[
@@ -40,6 +51,7 @@ def featurize(tee_df: pd.DataFrame, weather_df=None, slot_minutes: int = 10):
             "date",
             "weekday",
             "hour",
+            "minute_of_day",
             "slot_index",
             "slot_label",
             "slot_hour",
@@ -49,31 +61,191 @@ def featurize(tee_df: pd.DataFrame, weather_df=None, slot_minutes: int = 10):
     return X, y, meta
 
 
-def train_model(tee_df: pd.DataFrame, weather_df=None, slot_minutes: int = 10) -> RandomForestClassifier:
-    X, y, _ = featurize(tee_df, weather_df, slot_minutes=slot_minutes)
+def train_model(tee_df: pd.DataFrame, weather_df=None, course_id: str | None = None) -> RandomForestClassifier:
+    """Fit the booking model; with a course_id the features come from the memory-mapped store."""
+    X, y, _ = feature_matrix(tee_df, weather_df, course_id=course_id)
+    from sklearn.ensemble import RandomForestClassifier
+
     clf = RandomForestClassifier(n_estimators=200, random_state=7)
     clf.fit(X, y)
+    watermark = tee_df["tee_time"].max()
+    clf.teeiq_meta_ = {
+        "watermark": watermark,
+        "full_fit_watermark": watermark,
+        "n_rows": len(X),
+    }
+    return clf
+
+
+def update_model(
+    clf: RandomForestClassifier,
+    tee_df: pd.DataFrame,
+    weather_df=None,
+    trees_per_update: int = 20,
+    max_trees: int = 400,
+    full_retrain_days: int = 28,
+    drift_tolerance: float = 0.10,
+    min_rows: int = 20,
+    course_id: str | None = None,
+) -> RandomForestClassifier:
+    """
+    Incrementally update a model from train_model with rows newer than its watermark.
+
+    New rows are fitted by warm-starting extra trees onto the existing forest.
+    Falls back to a full retrain on `tee_df` when:
+    - the model has no watermark (not trained by train_model),
+    - more than `full_retrain_days` of data have passed since the last full fit,
+    - the forest would grow beyond `max_trees`,
+    - the new rows contain only one class, or
+    - mean predicted vs. actual booking rate on the new rows differs by more
+      than `drift_tolerance` plus two standard errors (drift).
+
+    `clf` is never modified (it may be shared, e.g. by teeiq.cache): the result is a new model,
+    or `clf` itself when there are too few new rows to update on.
+    """
+    meta = getattr(clf, "teeiq_meta_", None)
+    if meta is None:
+        return train_model(tee_df, weather_df, course_id)
+    new = tee_df[tee_df["tee_time"] > meta["watermark"]]
+    if len(new) < min_rows:
+        return clf
+
+    new_watermark = new["tee_time"].max()
+    if (
+        new_watermark - meta["full_fit_watermark"] > pd.Timedelta(days=full_retrain_days)
+        or clf.n_estimators + trees_per_update > max_trees
+    ):
+        return train_model(tee_df, weather_df, course_id)
+
+    X, y, _ = featurize(new, weather_df)
+    X = X.to_numpy(dtype=np.float32)
+    if y.nunique() < 2:
+        return train_model(tee_df, weather_df, course_id)
+
+    p_pred = float(clf.predict_proba(X)[:, 1].mean())
+    stderr = np.sqrt(p_pred * (1 - p_pred) / len(y))
+    if abs(p_pred - float(y.mean())) > drift_tolerance + 2 * stderr:
+        return train_model(tee_df, weather_df, course_id)
+
+    clf = copy.deepcopy(clf)
+    clf.set_params(warm_start=True, n_estimators=clf.n_estimators + trees_per_update)
+    clf.fit(X, y)
+    clf.teeiq_meta_ = {
+        **meta,
+        "watermark": new_watermark,
+        "n_rows": meta["n_rows"] + len(X),
+    }
     return clf
 
 
-def expected_utilization(clf: RandomForestClassifier, tee_df: pd.DataFrame, weather_df=None, slot_minutes: int = 10):
-    X, _, meta = featurize(tee_df, weather_df, slot_minutes=slot_minutes)
+def expected_utilization(
+    clf: RandomForestClassifier,
+    tee_df: pd.DataFrame,
+    weather_df=None,
+    slot_minutes: int = 10,
+    course_id: str | None = None,
+):
+    X, _, meta = feature_matrix(tee_df, weather_df, slot_minutes=slot_minutes, course_id=course_id)
     proba = clf.predict_proba(X)[:, 1]
     out = meta.copy()
     out["p_book"] = proba
 
     agg = out.groupby(
-        ["weekday", "slot_index", "slot_label", "slot_hour", "slot_minute"]
+        ["weekday", "slot_index", "slot_label", "slot_hour", "slot_minute"], observed=True
     ).agg(expected_util=("p_book", "mean")).reset_index()
     return agg
 
 
-def dynamic_price_suggestion(util_df: pd.DataFrame, target=0.75, price_col="avg_price"):
-    df = util_df.copy()
-    gap = (target - df["expected_util"]).clip(lower=0)
-    df["suggested_discount"] = (0.10 + 0.20 * (gap / target)).clip(upper=0.35)
-    if price_col not in df.columns:
-        df[price_col] = 0.0
-    df["new_price"] = df[price_col] * (1 - df["suggested_discount"])
-    return df
+def forecast_grid(tee_df: pd.DataFrame, weather_df=None, days: int = 7, start=None, slot_minutes: int = 10):
+    """
+    Build the feature grid for the next `days` days x every weekday/tee minute the course operates.
+
+    Prices come from the historical average per weekday/minute; weather (if given) is joined by date.
+    Returns (X, meta) where X has the same columns as featurize().
+    """
+    hist = tee_df[["tee_time", "price"]].copy()
+    hist["weekday"] = hist["tee_time"].dt.day_name()
+    hist["minute_of_day"] = hist["tee_time"].dt.hour * 60 + hist["tee_time"].dt.minute
+    profile = hist.groupby(["weekday", "minute_of_day"]).agg(
+        avg_price=("price", "mean")
+    ).reset_index()
+
+    start = pd.Timestamp.today().normalize() if start is None else pd.Timestamp(start).normalize()
+    dates = pd.DataFrame({"day": pd.date_range(start, periods=days, freq="D")})
+    dates["weekday"] = dates["day"].dt.day_name()
+    grid = dates.merge(profile, on="weekday", how="inner")
+
+    grid["weekday"] = pd.Categorical(grid["weekday"], categories=WEEK_ORDER, ordered=True)
+    grid["date"] = grid["day"].dt.date
+    grid["slot_index"] = grid["minute_of_day"] // slot_minutes
+    slot_start_min = grid["slot_index"] * slot_minutes
+    grid["slot_hour"] = slot_start_min // 60
+    grid["slot_minute"] = slot_start_min % 60
+    grid["slot_label"] = (
+        grid["slot_hour"].astype(str).str.zfill(2) + ":" + grid["slot_minute"].astype(str).str.zfill(2)
+    )
+
+    if weather_df is not None and isinstance(weather_df, pd.DataFrame) and not weather_df.empty:
+        w = weather_df[["date", "temperature_2m_max", "precipitation_sum"]].rename(
+            columns={"temperature_2m_max": "temp_max", "precipitation_sum": "precip"}
+        )
+        grid = grid.merge(w, on="date", how="left")
+    else:
+        grid["temp_max"] = np.nan
+        grid["precip"] = np.nan
+
+    X = pd.DataFrame(
+        {
+            "minute_of_day": grid["minute_of_day"],
+            "is_weekend": (grid["day"].dt.weekday >= 5).astype(int),
+            "price": grid["avg_price"],
+            "temp_max": grid["temp_max"],
+            "precip": grid["precip"],
+        }
+    )[FEATURES].ffill().bfill()
+
+    meta = grid[
+        ["date", "weekday", "minute_of_day", "slot_index", "slot_label", "slot_hour", "slot_minute", "avg_price"]
+    ]
+    return X, meta
+
+
+def forecast_utilization(
+    clf: RandomForestClassifier,
+    tee_df: pd.DataFrame,
+    weather_df=None,
+    days: int = 7,
+    start=None,
+    slot_minutes: int = 10,
+) -> pd.DataFrame:
+    """Score the forward-looking grid from forecast_grid() in one predict_proba call."""
+    X, meta = forecast_grid(tee_df, weather_df, days=days, start=start, slot_minutes=slot_minutes)
+    out = meta.copy()
+    out["p_book"] = clf.predict_proba(X.to_numpy(dtype=np.float32))[:, 1] if len(X) else np.array([], dtype=float)
+    return out
+
+
+def dynamic_price_suggestion(util_df: pd.DataFrame, target=0.75, price_col="avg_price", elasticity=None):
+    return suggest_prices(
+        util_df, util_col="expected_util", price_col=price_col, target=target, elasticity=elasticity
+    )
+
 
+def forecast_price_suggestion(
+    clf: RandomForestClassifier,
+    tee_df: pd.DataFrame,
+    weather_df=None,
+    days: int = 7,
+    start=None,
+    slot_minutes: int = 10,
+    target=0.75,
+) -> pd.DataFrame:
+    """Suggested prices per upcoming date x slot, from forecast_utilization() and historical elasticity."""
+    keys = ["date", "weekday", "slot_index", "slot_label", "slot_hour", "slot_minute"]
+    fc = forecast_utilization(clf, tee_df, weather_df, days=days, start=start, slot_minutes=slot_minutes)
+    slots = fc.groupby(keys, observed=True).agg(
+        expected_util=("p_book", "mean"), avg_price=("avg_price", "mean")
+    ).reset_index()
+    elasticity = estimate_elasticity(add_time_bins(tee_df, slot_minutes=slot_minutes))
+    slots = slots.merge(elasticity[["weekday", "slot_index", "elasticity"]], on=["weekday", "slot_index"], how="left")
+    return dynamic_price_suggestion(slots, target=target)
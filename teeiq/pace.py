@@ -0,0 +1,101 @@
+"""
+Booking-pace curves: how full each weekday/slot typically is N days before tee time.
+
+Needs a `booked_at` column (see clean_teetimes / adapters); bookings without a timestamp
+only count toward final fill (lead 0).
+"""
+import numpy as np
+import pandas as pd
+
+from .data_utils import add_time_bins
+
+LEAD_DAYS = (0, 1, 2, 3, 5, 7, 10, 14, 21, 30)
+
+
+def _lead_bin(lead_days, lead_grid) -> np.ndarray:
+    """Index of the largest grid lead <= each lead (unknown/negative leads -> 0)."""
+    lead = np.nan_to_num(np.asarray(lead_days, dtype=float), nan=0.0).clip(min=0)
+    return np.searchsorted(np.asarray(lead_grid, dtype=float), lead, side="right") - 1
+
+
+def pace_curves(df: pd.DataFrame, slot_minutes: int = 10, lead_days=LEAD_DAYS) -> pd.DataFrame:
+    """
+    Expected fill by lead time per weekday/slot.
+
+    Returns a frame indexed by (weekday, slot_index) with one column per lead in `lead_days`:
+    the historical share of slots already booked at least that many days ahead
+    (column 0 is final utilization), plus a `slots` column.
+    """
+    tmp = add_time_bins(df, slot_minutes=slot_minutes)
+    keys = ["weekday", "slot_index"]
+    slots = tmp.groupby(keys, observed=True).size().rename("slots")
+
+    booked = tmp[tmp["booked"].astype(bool)]
+    lead = booked["lead_days"] if "lead_days" in booked.columns else np.zeros(len(booked))
+    bins = pd.Series(_lead_bin(lead, lead_days), index=booked.index, name="lead_bin")
+
+    counts = (
+        booked[keys].assign(lead_bin=bins)
+        .groupby(keys + ["lead_bin"], observed=True).size()
+        .unstack("lead_bin")
+        .reindex(columns=range(len(lead_days)), fill_value=0)
+        .fillna(0)
+    )
+    # Booked at least L days ahead = bookings in bin L and every longer-lead bin
+    at_least = counts.to_numpy()[:, ::-1].cumsum(axis=1)[:, ::-1]
+    curves = pd.DataFrame(at_least, index=counts.index, columns=list(lead_days))
+    curves = curves.reindex(slots.index, fill_value=0)
+    curves = curves.div(slots, axis=0)
+    curves["slots"] = slots
+    return curves
+
+
+def pace_status(
+    curves: pd.DataFrame,
+    df: pd.DataFrame,
+    as_of=None,
+    slot_minutes: int = 10,
+    tolerance: float = 0.15,
+) -> pd.DataFrame:
+    """
+    Compare upcoming slots' bookings so far against the pace curves.
+
+    Only tee times after `as_of` (default now) are scored, and only bookings made by `as_of`
+    count. Returns per date/slot: slots, booked_now, expected_now, expected_final,
+    pace_ratio and behind (pace_ratio < 1 - tolerance).
+    """
+    as_of = pd.Timestamp.now() if as_of is None else pd.Timestamp(as_of)
+    upcoming = add_time_bins(df[df["tee_time"] > as_of], slot_minutes=slot_minutes)
+    if upcoming.empty:
+        return pd.DataFrame(
+            columns=["date", "weekday", "slot_index", "slot_label", "lead_days", "slots",
+                     "booked_now", "expected_now", "expected_final", "pace_ratio", "behind"]
+        )
+
+    booked_now = upcoming["booked"].astype(bool)
+    if "booked_at" in upcoming.columns:
+        booked_now &= upcoming["booked_at"].isna() | (upcoming["booked_at"] <= as_of)
+    upcoming = upcoming.assign(booked_now=booked_now.astype(int))
+
+    keys = ["date", "weekday", "slot_index", "slot_label"]
+    out = upcoming.groupby(keys, observed=True).agg(
+        slots=("booked_now", "size"),
+        booked_now=("booked_now", "sum"),
+        tee_time=("tee_time", "min"),
+    ).reset_index()
+    out["lead_days"] = (out["tee_time"] - as_of).dt.total_seconds() / 86400
+
+    lead_grid = [c for c in curves.columns if c != "slots"]
+    table = curves[lead_grid].to_numpy()
+    pos = curves.index.get_indexer(pd.MultiIndex.from_frame(out[["weekday", "slot_index"]].astype(object)))
+    col = _lead_bin(out["lead_days"], lead_grid)
+    known = pos >= 0
+    fill_now = np.where(known, table[np.where(known, pos, 0), col], np.nan)
+    fill_final = np.where(known, table[np.where(known, pos, 0), 0], np.nan)
+
+    out["expected_now"] = out["slots"] * fill_now
+    out["expected_final"] = out["slots"] * fill_final
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["pace_ratio"] = np.where(out["expected_now"] > 0, out["booked_now"] / out["expected_now"], np.nan)
+    out["behind"] = out["pace_ratio"] < 1 - tolerance
+    return out.drop(columns="tee_time").sort_values(["date", "slot_index"]).reset_index(drop=True)
@@ -1,17 +1,111 @@
 import os
-from sqlalchemy import create_engine
+from functools import lru_cache
 import pandas as pd
 
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///teeiq.db")
-engine = create_engine(DB_URL, future=True)
+# Columns saved to tee_times: clean_teetimes output plus optional vendor fields (tee/side for
+# simultaneous starts, holes, source).
+TEE_TIME_COLUMNS = [
+    "course_id", "tee_time", "price", "booked", "booked_at", "lead_days", "weekday", "hour", "date",
+    "holes", "source", "tee", "start_tee", "side", "course_side",
+]
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """SQLAlchemy engine, created (and sqlalchemy imported) on first database use."""
+    from sqlalchemy import create_engine
+    return create_engine(DB_URL, future=True)
+
+def _in_clause(sql: str):
+    from sqlalchemy import bindparam, text
+    return text(sql).bindparams(bindparam("cids", expanding=True))
+
+def _add_missing_columns(df: pd.DataFrame, table: str):
+    """Extend an existing table with new optional columns (e.g. booked_at) before appending."""
+    from sqlalchemy import inspect, text
+    engine = get_engine()
+    insp = inspect(engine)
+    if not insp.has_table(table):
+        return
+    existing = {c["name"] for c in insp.get_columns(table)}
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        for col in df.columns:
+            if col in existing:
+                continue
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                sql_type = "TIMESTAMP"
+            elif pd.api.types.is_numeric_dtype(df[col]):
+                sql_type = "FLOAT"
+            else:
+                sql_type = "TEXT"
+            conn.execute(text(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(col)} {sql_type}"))
 
 def save_teetimes(df: pd.DataFrame, course_id: str):
-    df = df.copy()
+    """Append cleaned tee times; columns outside TEE_TIME_COLUMNS (stray CSV headers) are not stored."""
+    df = df[[c for c in TEE_TIME_COLUMNS if c in df.columns]].copy()
     df["course_id"] = course_id
-    df.to_sql("tee_times", engine, if_exists="append", index=False)
+    _add_missing_columns(df, "tee_times")
+    df.to_sql("tee_times", get_engine(), if_exists="append", index=False)
 
 def load_teetimes(course_id: str) -> pd.DataFrame:
     try:
-        return pd.read_sql("SELECT * FROM tee_times WHERE course_id = :cid", engine, params={"cid": course_id})
+        return pd.read_sql(
+            "SELECT * FROM tee_times WHERE course_id = :cid", get_engine(), params={"cid": course_id}
+        )
+    except Exception:
+        return pd.DataFrame()
+
+def iter_teetimes(course_id: str, chunksize: int = 50_000):
+    """
+    Yield a course's tee_times rows in chunks of `chunksize` (constant memory).
+
+    Yields nothing if the query can't start (e.g. no tee_times table yet, like load_teetimes);
+    an error after the first chunk is raised so partial totals are never mistaken for complete ones.
+    """
+    started = False
+    try:
+        with get_engine().connect() as conn:
+            for chunk in pd.read_sql(
+                "SELECT * FROM tee_times WHERE course_id = :cid", conn, params={"cid": course_id}, chunksize=chunksize
+            ):
+                started = True
+                yield chunk
+    except Exception:
+        if started:
+            raise
+
+def load_teetimes_many(course_ids) -> pd.DataFrame:
+    """Tee times for several courses in one query (course_id column identifies each)."""
+    sql = _in_clause("SELECT * FROM tee_times WHERE course_id IN :cids")
+    try:
+        return pd.read_sql(sql, get_engine(), params={"cids": list(course_ids)})
     except Exception:
         return pd.DataFrame()
+
+def save_rival_rates(df: pd.DataFrame, course_id: str):
+    """
+    Append competitor rate observations for one of our courses.
+
+    Columns: rival, weekday ('Weekday', 'Weekend', 'All' or a day name), hour (optional, blank = all day),
+    rate, observed_at (defaults to now).
+    """
+    df = df.copy()
+    df["course_id"] = course_id
+    if "hour" not in df.columns:
+        df["hour"] = pd.NA
+    df["hour"] = pd.to_numeric(df["hour"], errors="coerce")
+    if "observed_at" not in df.columns:
+        df["observed_at"] = pd.Timestamp.now()
+    _add_missing_columns(df, "rival_rates")
+    df.to_sql("rival_rates", get_engine(), if_exists="append", index=False)
+
+def load_rival_rates(course_ids) -> pd.DataFrame:
+    sql = _in_clause("SELECT * FROM rival_rates WHERE course_id IN :cids")
+    try:
+        df = pd.read_sql(sql, get_engine(), params={"cids": list(course_ids)})
+    except Exception:
+        return pd.DataFrame(columns=["course_id", "rival", "weekday", "hour", "rate", "observed_at"])
+    df["observed_at"] = pd.to_datetime(df["observed_at"], errors="coerce")
+    return df
+
@@ -0,0 +1,219 @@
+import numpy as np
+import pandas as pd
+
+# Prior used when a slot's own price history carries too little variation.
+DEFAULT_ELASTICITY = -1.5
+ELASTICITY_BOUNDS = (-4.0, -0.1)
+# Prior std. dev. of an elasticity around the pooled (or default) value; estimates are
+# weighted against it by their standard error.
+PRIOR_SD = 0.5
+# Std. dev. of log price a group needs before its slope counts at all: a few percent of
+# rounding or promo-code noise is not a price experiment.
+MIN_PRICE_SPREAD = 0.10
+MIN_UTIL = 0.02
+
+
+def _shrink(raw, se, prior):
+    """Precision-weighted mean of an estimate (standard error `se`) and the prior."""
+    raw = np.where(np.isfinite(raw), raw, prior)
+    se = np.where(np.isfinite(se), se, np.inf)
+    weight = PRIOR_SD ** 2 / (PRIOR_SD ** 2 + se ** 2)
+    return prior + weight * (raw - prior)
+
+
+def _elasticity_se(sxx, n, rate):
+    """Standard error of slope/rate for Bernoulli bookings; inf when prices barely vary."""
+    var_rate = np.clip(rate, MIN_UTIL, 1 - MIN_UTIL)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se = np.sqrt((1 - var_rate) / (var_rate * sxx))
+        enough = (n > 1) & (sxx / n >= MIN_PRICE_SPREAD ** 2)
+    return np.where(enough, se, np.inf)
+
+
+# Per-row log-price moments; summable per group at any slot resolution.
+PRICE_MOMENTS = ["lp_n", "lp_x", "lp_y", "lp_xx", "lp_xy"]
+
+
+def add_price_moments(df: pd.DataFrame) -> pd.DataFrame:
+    """Add PRICE_MOMENTS columns (rows without a positive price contribute zeros)."""
+    df = df.copy()
+    valid = df["price"] > 0
+    x = np.log(df["price"].where(valid).astype(float)).fillna(0.0)
+    y = df["booked"].astype(float).where(valid, 0.0)
+    df["lp_n"] = valid.astype(float)
+    df["lp_x"] = x
+    df["lp_y"] = y
+    df["lp_xx"] = x * x
+    df["lp_xy"] = x * y
+    return df
+
+
+def elasticity_from_moments(g: pd.DataFrame) -> np.ndarray:
+    """
+    Per-group elasticity from summed PRICE_MOMENTS.
+
+    For each group a least-squares slope of booked on log(price) is converted to an
+    elasticity at the group's booking rate. Each estimate is shrunk toward the pooled
+    (within-group) estimate by its standard error, and the pooled estimate toward
+    DEFAULT_ELASTICITY the same way; groups whose prices barely vary use the prior.
+    """
+    n = g["lp_n"].to_numpy(dtype=float)
+    sx, sy = g["lp_x"].to_numpy(), g["lp_y"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sxx = g["lp_xx"].to_numpy() - sx ** 2 / n
+        sxy = g["lp_xy"].to_numpy() - sx * sy / n
+        sxx = np.where(n > 0, sxx, 0.0)
+        sxy = np.where(n > 0, sxy, 0.0)
+        rate = np.clip(sy / n, MIN_UTIL, None)
+        raw = sxy / sxx / rate
+        total_n, total_sxx = n.sum(), sxx.sum()
+        pooled_rate = max(sy.sum() / max(total_n, 1.0), MIN_UTIL)
+        pooled_raw = sxy.sum() / total_sxx / pooled_rate if total_sxx > 0 else np.nan
+
+    pooled = _shrink(pooled_raw, _elasticity_se(total_sxx, total_n, pooled_rate), DEFAULT_ELASTICITY)
+    return np.clip(_shrink(raw, _elasticity_se(sxx, n, rate), pooled), *ELASTICITY_BOUNDS)
+
+
+def estimate_elasticity(df: pd.DataFrame, keys=("weekday", "slot_index")) -> pd.DataFrame:
+    """
+    Per-slot price elasticity of booking probability from historical price variation.
+
+    `df` must already carry the `keys` columns (see add_time_bins).
+    Returns columns: *keys, obs, elasticity
+    """
+    keys = list(keys)
+    g = add_price_moments(df[keys + ["price", "booked"]]).groupby(keys, observed=True)[PRICE_MOMENTS].sum()
+    g = g.reset_index()
+    g["obs"] = g["lp_n"].astype(int)
+    g["elasticity"] = elasticity_from_moments(g)
+    return g[keys + ["obs", "elasticity"]]
+
+
+def optimize_prices(
+    util,
+    price,
+    elasticity,
+    target=0.75,
+    max_discount: float = 0.35,
+    steps: int = 36,
+):
+    """
+    Revenue-maximizing discounts for many slots at once.
+
+    Demand follows constant elasticity, util(d) = util * (1 - d) ** elasticity, capped at 1.
+    Each slot is only discounted as far as needed to reach `target` (and never past
+    `max_discount`); within that range the discount with the highest expected revenue
+    per slot wins. Slots already at or above target keep their price.
+
+    `target` may be a scalar or an array of shape (S, 1) to solve S target scenarios
+    in one pass. Returns (discount, new_price, projected_util) broadcast to
+    (n_slots,) or (S, n_slots).
+    """
+    u = np.clip(np.asarray(util, dtype=float), MIN_UTIL, 1.0)
+    p = np.asarray(price, dtype=float)
+    e = np.broadcast_to(np.asarray(elasticity, dtype=float), u.shape)
+    target = np.asarray(target, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d_needed = 1 - (target / u) ** (1 / e)
+    d_cap = np.clip(np.nan_to_num(d_needed, nan=0.0), 0.0, max_discount)
+
+    grid = np.linspace(0.0, max_discount, steps + 1)
+    d = np.minimum(grid, d_cap[..., None])
+    proj = np.clip(u[:, None] * (1 - d) ** e[:, None], 0.0, 1.0)
+    revenue = (1 - d) * proj
+
+    best = revenue.argmax(axis=-1)[..., None]
+    discount = np.take_along_axis(d, best, axis=-1)[..., 0]
+    projected = np.take_along_axis(proj, best, axis=-1)[..., 0]
+    return discount, p * (1 - discount), projected
+
+
+def simulate_scenarios(
+    slot_df: pd.DataFrame,
+    discounts=None,
+    targets=None,
+    util_col: str = "expected_util",
+    price_col: str = "avg_price",
+    max_discount: float = 0.35,
+) -> pd.DataFrame:
+    """
+    Evaluate many pricing scenarios against one slot table in a single batched pass.
+
+    - `discounts`: uniform discounts applied to every slot
+    - `targets`: target utilizations, each solved with optimize_prices()
+
+    `slot_df` needs `slots`, `util_col`, `price_col` and optionally `elasticity`.
+    Returns one row per scenario: kind, value, projected_util, bookings, revenue, revenue_lift
+    """
+    slots = slot_df["slots"].to_numpy(dtype=float)
+    u = np.clip(slot_df[util_col].to_numpy(dtype=float), MIN_UTIL, 1.0)
+    p = slot_df[price_col].to_numpy(dtype=float)
+    if "elasticity" in slot_df.columns:
+        e = slot_df["elasticity"].fillna(DEFAULT_ELASTICITY).to_numpy(dtype=float)
+    else:
+        e = np.full(len(u), DEFAULT_ELASTICITY)
+
+    frames = []
+    if discounts is not None:
+        d = np.asarray(discounts, dtype=float)[:, None]
+        proj = np.clip(u * (1 - d) ** e, 0.0, 1.0)
+        frames.append(("discount", d[:, 0], proj, p * (1 - d)))
+    if targets is not None:
+        t = np.asarray(targets, dtype=float)[:, None]
+        _, new_price, proj = optimize_prices(u, p, e, target=t, max_discount=max_discount)
+        frames.append(("target", t[:, 0], proj, new_price))
+
+    base_revenue = float((slots * u * p).sum())
+    out = []
+    for kind, values, proj, new_price in frames:
+        bookings = (slots * proj).sum(axis=1)
+        revenue = (slots * proj * new_price).sum(axis=1)
+        out.append(pd.DataFrame({
+            "kind": kind,
+            "value": values,
+            "projected_util": bookings / max(slots.sum(), 1.0),
+            "bookings": bookings,
+            "revenue": revenue,
+            "revenue_lift": revenue - base_revenue,
+        }))
+    if not out:
+        return pd.DataFrame(columns=["kind", "value", "projected_util", "bookings", "revenue", "revenue_lift"])
+    return pd.concat(out, ignore_index=True)
+
+
+def suggest_prices(
+    df: pd.DataFrame,
+    util_col: str = "util",
+    price_col: str = "avg_price",
+    target: float = 0.75,
+    max_discount: float = 0.35,
+    elasticity=None,
+) -> pd.DataFrame:
+    """
+    Add elasticity, suggested_discount, new_price and projected_util columns to a slot table.
+
+    Elasticity comes from `elasticity` (scalar or array) if given, else an existing
+    `elasticity` column (missing values -> DEFAULT_ELASTICITY).
+    """
+    df = df.copy()
+    if elasticity is not None:
+        df["elasticity"] = elasticity
+    elif "elasticity" in df.columns:
+        df["elasticity"] = df["elasticity"].fillna(DEFAULT_ELASTICITY)
+    else:
+        df["elasticity"] = DEFAULT_ELASTICITY
+    if price_col not in df.columns:
+        df[price_col] = 0.0
+
+    discount, new_price, projected = optimize_prices(
+        df[util_col].to_numpy(),
+        df[price_col].to_numpy(),
+        df["elasticity"].to_numpy(),
+        target=target,
+        max_discount=max_discount,
+    )
+    df["suggested_discount"] = discount
+    df["new_price"] = new_price
+    df["projected_util"] = projected
+    return df
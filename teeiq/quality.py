@@ -0,0 +1,171 @@
+"""
+Data-quality scan for tee-sheet imports: one vectorized pass over cleaned chunks.
+
+Rows that would corrupt analytics are quarantined (returned separately, never saved):
+- nat_tee_time: tee_time could not be parsed (breaks dt.hour grouping)
+- negative_price: price below zero
+- duplicate: same tee time (and tee/side column, if any) seen earlier in the file; inflates utilization
+
+Suspicious rows are kept but counted, with a capped sample for review:
+- price_outlier: log-price more than `outlier_z` robust z-scores from the chunk median
+- bad_spacing: tee time less than `min_spacing` minutes after the previous one on the same tee
+- imputed_price: price was missing; ingest fills it from the weekday x hour median of the whole file
+
+Days whose slot count is under `partial_share` x the median day are reported as partially covered.
+Chunks should be cleaned with clean_teetimes(..., impute=False, strict=False): unparseable tee times
+then reach the scanner as NaT (instead of raising) and prices are imputed once over the kept rows.
+State carried between chunks is small: hashes of seen tee times, the last tee time per day/tee
+(so spacing is checked across chunk boundaries for time-ordered files) and per-day counts.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .data_utils import impute_prices
+
+QUARANTINE_ISSUES = ["nat_tee_time", "negative_price", "duplicate"]
+FLAG_ISSUES = ["price_outlier", "bad_spacing", "imputed_price"]
+ISSUES = QUARANTINE_ISSUES + FLAG_ISSUES
+# Columns that distinguish simultaneous starts (e.g. 1st and 10th tee) in some exports.
+TEE_COLUMNS = ("tee", "start_tee", "side", "course_side")
+SAMPLE_ROWS = 500
+
+
+def _issue_counts() -> dict:
+    return dict.fromkeys(ISSUES, 0)
+
+
+@dataclass
+class QualityReport:
+    source: str = ""
+    rows: int = 0
+    kept: int = 0
+    counts: dict = field(default_factory=_issue_counts)
+    partial_days: list = field(default_factory=list)
+    flagged: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def quarantined(self) -> int:
+        return self.rows - self.kept
+
+    def summary(self) -> pd.DataFrame:
+        """One row per issue: rows affected, share of the file and what was done."""
+        out = pd.DataFrame({"issue": ISSUES, "rows": [self.counts[i] for i in ISSUES]})
+        out["share"] = out["rows"] / self.rows if self.rows else 0.0
+        out["action"] = np.where(out["issue"].isin(QUARANTINE_ISSUES), "quarantined", "flagged")
+        partial = pd.DataFrame(
+            {"issue": ["partial_day"], "rows": [len(self.partial_days)], "share": [np.nan], "action": ["flagged (days)"]}
+        )
+        return pd.concat([out, partial], ignore_index=True)
+
+
+class QualityScanner:
+    def __init__(
+        self,
+        source: str = "",
+        min_spacing: float = 5.0,
+        outlier_z: float = 5.0,
+        partial_share: float = 0.5,
+    ):
+        self.min_spacing = pd.Timedelta(minutes=min_spacing)
+        self.outlier_z = outlier_z
+        self.partial_share = partial_share
+        self.report = QualityReport(source=source)
+        self._seen: set[int] = set()
+        self._last: pd.DataFrame | None = None
+        self._day_slots = pd.Series(dtype="int64")
+        self._samples: list[pd.DataFrame] = []
+
+    def scan(self, chunk: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Check one cleaned chunk (see clean_teetimes). Returns (kept rows, quarantined rows);
+        quarantined rows carry an `issue` column.
+        """
+        rep = self.report
+        rep.rows += len(chunk)
+        tee_cols = [c for c in TEE_COLUMNS if c in chunk.columns]
+        nat = chunk["tee_time"].isna().to_numpy()
+        negative = (chunk["price"] < 0).to_numpy() & ~nat
+        # Duplicates: within the chunk and against every earlier chunk
+        keys = pd.util.hash_pandas_object(chunk[["tee_time", *tee_cols]], index=False).to_numpy()
+        seen = np.fromiter((k in self._seen for k in keys.tolist()), dtype=bool, count=len(keys))
+        dup = (pd.Series(keys).duplicated().to_numpy() | seen) & ~nat & ~negative
+        self._seen.update(keys[~nat & ~negative].tolist())
+
+        rep.counts["nat_tee_time"] += int(nat.sum())
+        rep.counts["negative_price"] += int(negative.sum())
+        rep.counts["duplicate"] += int(dup.sum())
+        bad = nat | negative | dup
+        issue = np.select([nat, negative, dup], QUARANTINE_ISSUES, "")
+        kept, quarantined = chunk[~bad], chunk[bad].assign(issue=issue[bad])
+        rep.kept += len(kept)
+        # Missing prices are imputed by ingest; chunks cleaned with impute=True report them in attrs.
+        rep.counts["imputed_price"] += int(kept["price"].isna().sum()) or int(chunk.attrs.get("imputed_prices", 0))
+        if kept.empty:
+            return kept, quarantined
+
+        outlier = self._price_outliers(kept["price"]).to_numpy()
+        spacing = self._bad_spacing(kept, tee_cols)
+        rep.counts["price_outlier"] += int(outlier.sum())
+        rep.counts["bad_spacing"] += int(spacing.sum())
+        flagged = outlier | spacing
+        if flagged.any() and sum(len(s) for s in self._samples) < SAMPLE_ROWS:
+            labels = np.char.strip(np.char.add(
+                np.where(outlier[flagged], "price_outlier", ""),
+                np.where(spacing[flagged], " bad_spacing", ""),
+            ))
+            self._samples.append(kept[flagged].assign(issue=labels).head(SAMPLE_ROWS))
+
+        self._day_slots = self._day_slots.add(kept.groupby("date").size(), fill_value=0)
+        return kept, quarantined
+
+    def _price_outliers(self, price: pd.Series) -> pd.Series:
+        logp = np.log(price.where(price > 0))
+        med = logp.median()
+        mad = (logp - med).abs().median() * 1.4826
+        if not np.isfinite(mad) or mad == 0:
+            return pd.Series(False, index=price.index)
+        return ((logp - med).abs() / mad > self.outlier_z).fillna(False)
+
+    def _bad_spacing(self, kept: pd.DataFrame, tee_cols: list) -> np.ndarray:
+        group = ["date", *tee_cols]
+        cur = kept[[*group, "tee_time"]].assign(_row=np.arange(len(kept)))
+        frames = [cur] if self._last is None else [self._last.assign(_row=-1), cur]
+        tt = pd.concat(frames, ignore_index=True).sort_values([*group, "tee_time"])
+        gap = tt.groupby(group, sort=False, dropna=False)["tee_time"].diff()
+        close = (gap > pd.Timedelta(0)) & (gap < self.min_spacing) & (tt["_row"] >= 0)
+        self._last = tt.groupby(group, sort=False, dropna=False).tail(1).drop(columns="_row")
+        hit = np.zeros(len(kept), dtype=bool)
+        hit[tt.loc[close, "_row"].to_numpy()] = True
+        return hit
+
+    def finish(self) -> QualityReport:
+        rep = self.report
+        if len(self._day_slots):
+            threshold = self.partial_share * self._day_slots.median()
+            rep.partial_days = sorted(self._day_slots[self._day_slots < threshold].index)
+        rep.flagged = pd.concat(self._samples, ignore_index=True).head(SAMPLE_ROWS) if self._samples else pd.DataFrame()
+        return rep
+
+
+def ingest(chunks, convert, source: str = "", **scanner_kwargs):
+    """
+    Clean and scan raw chunks in a single pass: convert(chunk) -> cleaned chunk (clean_teetimes or
+    a vendor adapter, ideally with impute=False, strict=False). Missing prices on kept rows are
+    imputed once over the whole file. Returns (clean tee times, quarantined rows, QualityReport).
+    """
+    scanner = QualityScanner(source, **scanner_kwargs)
+    kept, quarantined = [], []
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        good, bad = scanner.scan(convert(chunk))
+        kept.append(good)
+        quarantined.append(bad)
+    report = scanner.finish()
+    clean = pd.DataFrame()
+    if kept:
+        clean = impute_prices(pd.concat(kept, ignore_index=True)).sort_values("tee_time", ignore_index=True)
+    bad = pd.concat(quarantined, ignore_index=True) if quarantined else pd.DataFrame()
+    return clean, bad, report
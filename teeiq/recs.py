@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from .data_utils import WEEK_ORDER, add_time_bins
+from .data_utils import minute_aggregate, rollup_slots
+from .pricing import PRICE_MOMENTS, add_price_moments, elasticity_from_moments, suggest_prices
 
 
 def low_fill_opportunities(
@@ -15,35 +16,30 @@ def low_fill_opportunities(
     Returns columns:
     - weekday, slot_index, slot_label, hour, minute
     - slots, booked, avg_price, util
-    - suggested_discount, new_price, expected_additional_bookings, est_monthly_lift
+    - elasticity, suggested_discount, new_price, projected_util
+    - expected_additional_bookings, est_monthly_lift
     """
-    tmp = add_time_bins(df, slot_minutes=slot_minutes).copy()
-    tmp["weekday"] = pd.Categorical(
-        tmp["weekday"], categories=WEEK_ORDER, ordered=True
+    base = minute_aggregate(add_price_moments(df), sum_cols=PRICE_MOMENTS)
+    agg = rollup_slots(base, slot_minutes=slot_minutes).rename(
+        columns={"slot_hour": "hour", "slot_minute": "minute"}
     )
-
-    agg = tmp.groupby(["weekday", "slot_index", "slot_label"]).agg(
-        slots=("booked", "size"),
-        booked=("booked", "sum"),
-        avg_price=("price", "mean"),
-        hour=("slot_hour", "first"),
-        minute=("slot_minute", "first"),
-    ).reset_index()
-
+    agg["elasticity"] = elasticity_from_moments(agg)
     agg["util"] = np.where(agg["slots"] > 0, agg["booked"] / agg["slots"], np.nan)
 
     opp = agg[(agg["slots"] >= min_slots) & (agg["util"] < util_threshold)].copy()
-
-    target = 0.75
-    gap = (target - opp["util"]).clip(lower=0)
-    opp["suggested_discount"] = (0.10 + 0.20 * (gap / target)).clip(upper=0.35)
-    opp["new_price"] = opp["avg_price"] * (1 - opp["suggested_discount"])
+    opp = suggest_prices(opp, util_col="util", target=0.75)
     opp["expected_additional_bookings"] = (
-        opp["slots"] * (target - opp["util"]).clip(lower=0)
+        opp["slots"] * (opp["projected_util"] - opp["util"]).clip(lower=0)
     ).round().astype(int)
     opp["est_monthly_lift"] = (
         opp["expected_additional_bookings"] * opp["new_price"]
     ).round(2)
 
-    return opp.sort_values(["weekday", "slot_index"])
+    cols = [
+        "weekday", "slot_index", "slot_label", "hour", "minute",
+        "slots", "booked", "avg_price", "util",
+        "elasticity", "suggested_discount", "new_price", "projected_util",
+        "expected_additional_bookings", "est_monthly_lift",
+    ]
+    return opp[cols].sort_values(["weekday", "slot_index"])
 
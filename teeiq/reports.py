@@ -2,11 +2,9 @@ from datetime import datetime, timedelta
 import io
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.utils import ImageReader
+
+# matplotlib and reportlab are imported inside the functions so that importing this
+# module (e.g. from a Streamlit page) doesn't pay for them until a PDF is built.
 
 def _png_from_matplotlib(fig, dpi=150):
     buf = io.BytesIO()
@@ -14,7 +12,10 @@ def _png_from_matplotlib(fig, dpi=150):
     buf.seek(0)
     return buf
 
-def _draw_table(c, x, y, rows, col_widths, header_fill=colors.HexColor("#eaf2ec")):
+def _draw_table(c, x, y, rows, col_widths, header_fill=None):
+    from reportlab.lib import colors
+
+    header_fill = header_fill or colors.HexColor("#eaf2ec")
     row_h = 18
     for r, row in enumerate(rows):
         yy = y - r*row_h
@@ -40,6 +41,12 @@ def make_advanced_weekly_pdf(
     top_actions: list[list],
     notes: list[str] = None,
 ):
+    from matplotlib.figure import Figure
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
     c = canvas.Canvas(filename, pagesize=letter)
 
     # Header
@@ -57,20 +64,21 @@ def make_advanced_weekly_pdf(
         c.drawString(72, y, f"• {k}: {v}"); y -= 18
 
     # Trend chart
-    fig1, ax1 = plt.subplots(figsize=(6, 2))
+    # Figure objects rather than pyplot: this runs on job-queue worker threads
+    fig1 = Figure(figsize=(6, 2)); ax1 = fig1.subplots()
     ax1.plot(trend_df["date"], trend_df["util"]*100, marker="o")
     ax1.set_ylabel("Utilization (%)"); ax1.set_xlabel("Date")
     ax1.grid(True, alpha=0.3)
-    img1 = _png_from_matplotlib(fig1); plt.close(fig1)
+    img1 = _png_from_matplotlib(fig1)
     c.drawImage(ImageReader(img1), 72, 520, width=460, height=150, preserveAspectRatio=True, mask='auto')
 
     # Heatmap chart
-    fig2, ax2 = plt.subplots(figsize=(6, 2))
+    fig2 = Figure(figsize=(6, 2)); ax2 = fig2.subplots()
     im = ax2.imshow(heatmap, aspect="auto")
     ax2.set_yticks(range(len(heatmap_ylabels))); ax2.set_yticklabels(heatmap_ylabels)
     ax2.set_xticks(range(len(heatmap_xlabels))); ax2.set_xticklabels(heatmap_xlabels, rotation=0)
     ax2.set_title("Utilization Heatmap"); fig2.colorbar(im, ax=ax2, fraction=0.02, pad=0.02)
-    img2 = _png_from_matplotlib(fig2); plt.close(fig2)
+    img2 = _png_from_matplotlib(fig2)
     c.drawImage(ImageReader(img2), 72, 350, width=460, height=140, preserveAspectRatio=True, mask='auto')
 
     # Notes
@@ -0,0 +1,67 @@
+import pandas as pd
+import streamlit as st
+
+from .cache import course_frame, course_series
+from .data_utils import clean_teetimes
+from .jobs import DONE, FAILED, get_queue
+from .timeseries import DailySeries
+
+
+def current_teetimes() -> pd.DataFrame:
+    """
+    Cleaned tee times for this browser session.
+
+    A saved course (st.session_state["course_id"]) is served from the process-wide cache,
+    so every session viewing it shares one copy. Ad-hoc uploads/demo data
+    (st.session_state["tee_df"]) stay per session. Returns an empty frame if nothing is loaded.
+    """
+    course_id = st.session_state.get("course_id")
+    if course_id:
+        return course_frame(course_id)
+    raw = st.session_state.get("tee_df")
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+    return clean_teetimes(raw)
+
+
+def current_series(df: pd.DataFrame | None = None) -> DailySeries:
+    """Daily rolling series for this session (shared and incrementally updated for saved courses)."""
+    course_id = st.session_state.get("course_id")
+    if course_id:
+        return course_series(course_id)
+    return DailySeries.from_frame(current_teetimes() if df is None else df)
+
+
+def use_course(course_id: str):
+    st.session_state["course_id"] = course_id
+    st.session_state.pop("tee_df", None)
+
+
+def use_frame(df: pd.DataFrame):
+    st.session_state["tee_df"] = df
+    st.session_state.pop("course_id", None)
+
+
+def job_status(job_id: str, label: str) -> dict:
+    """
+    Show a background job's progress and return its status dict.
+
+    While the job is queued/running a fragment polls it every second and reruns the page once
+    it finishes, so the rest of the page stays usable in the meantime.
+    """
+    queue = get_queue()
+    job = queue.status(job_id)
+    if job is None:
+        return {"status": FAILED, "error": "Unknown job"}
+    if job["status"] == FAILED:
+        st.error(f"{label} failed: {job['error']}")
+    elif job["status"] != DONE:
+        @st.fragment(run_every=1.0)
+        def _poll():
+            current = queue.status(job_id)
+            if current["status"] in (DONE, FAILED):
+                st.rerun()
+            st.progress(current["progress"] or 0.0, text=f"{label}: {current['message'] or current['status']}")
+
+        _poll()
+    return job
@@ -0,0 +1,172 @@
+"""
+Monte Carlo fill and revenue forecasts from per-tee-time booking probabilities.
+
+Each draw books every upcoming tee time with its model probability (forecast_utilization's
+p_book). An optional day-level demand shock on the logit scale makes tee times on the same day
+fill together, as they do in practice (weather, events). Draws are simulated in batches as
+(draws x tee times) arrays and summed per day with np.add.reduceat. That gives per-day fill
+and revenue distributions, such as P10/P90 and the chance of reaching the target fill, without
+any Python loop over days or draws.
+"""
+import numpy as np
+import pandas as pd
+
+DAILY_COLUMNS = [
+    "date", "slots", "expected_fill", "fill_p10", "fill_p50", "fill_p90", "p_reach_target",
+    "expected_revenue", "revenue_p10", "revenue_p50", "revenue_p90",
+]
+SUMMARY_COLUMNS = [
+    "days", "slots", "expected_fill", "fill_p10", "fill_p90", "p_reach_target",
+    "expected_revenue", "revenue_p10", "revenue_p50", "revenue_p90",
+]
+
+
+def day_shock_sigma(tee_df: pd.DataFrame) -> float:
+    """
+    Std. dev. of day-level demand shocks (logit scale) from history: spread of daily fill
+    around its weekday mean, minus what binomial noise alone would produce.
+    """
+    daily = tee_df.groupby("date").agg(n=("booked", "size"), b=("booked", "sum"))
+    if len(daily) < 3:
+        return 0.0
+    u = (daily["b"] + 0.5) / (daily["n"] + 1)
+    logit = np.log(u / (1 - u))
+    weekday = pd.to_datetime(pd.Series(daily.index, index=daily.index)).dt.day_name()
+    resid = logit - logit.groupby(weekday).transform("mean")
+    noise = (1 / (daily["n"] * u * (1 - u))).mean()
+    return float(np.sqrt(max(resid.var() - noise, 0.0)))
+
+
+def simulate_bookings(
+    p_book,
+    price,
+    day_index,
+    n_days: int,
+    n_draws: int = 2000,
+    day_sigma: float = 0.0,
+    seed: int | None = 7,
+    batch: int = 500,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulated bookings and revenue per day: two (n_draws x n_days) arrays.
+
+    `day_index` gives each tee time's day (0..n_days-1) and must be sorted.
+    """
+    p = np.clip(np.asarray(p_book, dtype=np.float64), 1e-6, 1 - 1e-6)
+    price = np.asarray(price, dtype=np.float64)
+    day_index = np.asarray(day_index)
+    starts = np.searchsorted(day_index, np.arange(n_days))
+    logit = np.log(p / (1 - p))
+    rng = np.random.default_rng(seed)
+
+    booked = np.empty((n_draws, n_days))
+    revenue = np.empty((n_draws, n_days))
+    for lo in range(0, n_draws, batch):
+        nb = min(batch, n_draws - lo)
+        if day_sigma > 0:
+            shock = rng.standard_normal((nb, n_days)) * day_sigma
+            probs = 1 / (1 + np.exp(-(logit + shock[:, day_index])))
+        else:
+            probs = p
+        hits = rng.random((nb, len(p))) < probs
+        booked[lo:lo + nb] = np.add.reduceat(hits, starts, axis=1)
+        revenue[lo:lo + nb] = np.add.reduceat(hits * price, starts, axis=1)
+    return booked, revenue
+
+
+def fill_forecast(
+    forecast: pd.DataFrame,
+    target: float = 0.75,
+    n_draws: int = 2000,
+    day_sigma: float = 0.0,
+    seed: int | None = 7,
+    p_col: str = "p_book",
+    price_col: str = "avg_price",
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Interval forecasts from forecast_utilization() output (one row per upcoming tee time).
+
+    Returns (daily, summary):
+    - daily: per date, slots, expected fill, fill P10/P50/P90, p_reach_target, and
+      expected revenue with P10/P50/P90
+    - summary: one row for the whole horizon (draws are summed across days, so the revenue
+      interval keeps the day-to-day correlation)
+    """
+    if forecast.empty:
+        return pd.DataFrame(columns=DAILY_COLUMNS), pd.DataFrame(columns=SUMMARY_COLUMNS)
+    fc = forecast.sort_values("date", kind="stable")
+    dates, day_index = np.unique(fc["date"].to_numpy(), return_inverse=True)
+    slots = np.bincount(day_index, minlength=len(dates))
+    booked, revenue = simulate_bookings(
+        fc[p_col], fc[price_col].fillna(0.0), day_index, len(dates),
+        n_draws=n_draws, day_sigma=day_sigma, seed=seed,
+    )
+
+    fill = booked / slots
+    q_fill = np.quantile(fill, [0.1, 0.5, 0.9], axis=0)
+    q_rev = np.quantile(revenue, [0.1, 0.5, 0.9], axis=0)
+    daily = pd.DataFrame({
+        "date": dates,
+        "slots": slots,
+        "expected_fill": fill.mean(axis=0),
+        "fill_p10": q_fill[0],
+        "fill_p50": q_fill[1],
+        "fill_p90": q_fill[2],
+        "p_reach_target": (fill >= target).mean(axis=0),
+        "expected_revenue": revenue.mean(axis=0),
+        "revenue_p10": q_rev[0],
+        "revenue_p50": q_rev[1],
+        "revenue_p90": q_rev[2],
+    })
+
+    total_fill = booked.sum(axis=1) / slots.sum()
+    total_rev = revenue.sum(axis=1)
+    summary = pd.DataFrame([{
+        "days": len(dates),
+        "slots": int(slots.sum()),
+        "expected_fill": total_fill.mean(),
+        "fill_p10": np.quantile(total_fill, 0.1),
+        "fill_p90": np.quantile(total_fill, 0.9),
+        "p_reach_target": (total_fill >= target).mean(),
+        "expected_revenue": total_rev.mean(),
+        "revenue_p10": np.quantile(total_rev, 0.1),
+        "revenue_p50": np.quantile(total_rev, 0.5),
+        "revenue_p90": np.quantile(total_rev, 0.9),
+    }])
+    return daily, summary
+
+
+def course_fill_forecast(
+    course_id: str,
+    days: int = 7,
+    start=None,
+    target: float = 0.75,
+    n_draws: int = 2000,
+    seed: int | None = 7,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """fill_forecast for a saved course, using its cached model and historical day-shock sigma."""
+    from .cache import course_frame, course_model
+    from .model import forecast_utilization
+
+    df = course_frame(course_id)
+    if df.empty:
+        return pd.DataFrame(columns=DAILY_COLUMNS), pd.DataFrame(columns=SUMMARY_COLUMNS)
+    fc = forecast_utilization(course_model(course_id), df, days=days, start=start)
+    return fill_forecast(fc, target=target, n_draws=n_draws, day_sigma=day_shock_sigma(df), seed=seed)
+
+
+def batch_fill_forecasts(course_ids, days: int = 7, start=None, target: float = 0.75, n_draws: int = 2000):
+    """Nightly batch: (daily, summary) for every course, with a course_id column."""
+    daily, summary = [], []
+    for cid in course_ids:
+        d, s = course_fill_forecast(cid, days=days, start=start, target=target, n_draws=n_draws)
+        if s.empty:
+            continue
+        daily.append(d.assign(course_id=cid))
+        summary.append(s.assign(course_id=cid))
+    if not daily:
+        return pd.DataFrame(columns=["course_id", *DAILY_COLUMNS]), pd.DataFrame(columns=["course_id", *SUMMARY_COLUMNS])
+    return (
+        pd.concat(daily, ignore_index=True)[["course_id", *DAILY_COLUMNS]],
+        pd.concat(summary, ignore_index=True)[["course_id", *SUMMARY_COLUMNS]],
+    )
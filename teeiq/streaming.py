@@ -0,0 +1,105 @@
+"""
+Streaming KPIs: fold chunks of tee times into small, mergeable partial aggregates.
+
+Memory is bounded by the number of distinct days, not rows, and partials from different
+chunks, courses or worker processes combine with KpiPartial.merge().
+
+Totals equal analytics.kpis on the full frame when every row has a price, as saved courses do
+(they are cleaned before saving). Raw chunks with missing prices are imputed chunk by chunk
+(weekday x hour median within the chunk), so revenue and potential can differ slightly from
+cleaning the whole file at once: an exact median would need every price kept in memory.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import reduce
+
+import pandas as pd
+
+from .data_utils import clean_teetimes
+from .persistence import iter_teetimes
+
+
+def _empty_daily() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"slots": pd.Series(dtype="int64"), "booked": pd.Series(dtype="int64"), "revenue": pd.Series(dtype="float64")},
+        index=pd.Index([], name="date"),
+    )
+
+
+@dataclass
+class KpiPartial:
+    total: int = 0
+    booked: int = 0
+    revenue: float = 0.0
+    potential: float = 0.0
+    daily: pd.DataFrame = field(default_factory=_empty_daily)
+
+    def update(self, chunk: pd.DataFrame) -> "KpiPartial":
+        """Fold one cleaned chunk (see clean_teetimes) into this partial."""
+        booked = chunk["booked"].astype(bool)
+        price = chunk["price"].astype(float)
+        self.total += len(chunk)
+        self.booked += int(booked.sum())
+        self.revenue += float(price[booked].sum())
+        self.potential += float(price[~booked].sum())
+
+        day = pd.DataFrame({
+            "date": chunk["date"],
+            "slots": 1,
+            "booked": booked.astype(int),
+            "revenue": price.where(booked, 0.0),
+        })
+        self.daily = self.daily.add(day.groupby("date").sum(), fill_value=0)
+        return self
+
+    def merge(self, other: "KpiPartial") -> "KpiPartial":
+        return KpiPartial(
+            total=self.total + other.total,
+            booked=self.booked + other.booked,
+            revenue=self.revenue + other.revenue,
+            potential=self.potential + other.potential,
+            daily=self.daily.add(other.daily, fill_value=0),
+        )
+
+    def kpis(self):
+        """Same tuple layout as analytics.kpis: (total, booked, util, revenue, potential)."""
+        util = self.booked / self.total if self.total else 0.0
+        return self.total, self.booked, util, self.revenue, self.potential
+
+    def daily_utilization(self) -> pd.DataFrame:
+        """Same shape as analytics.daily_utilization: columns date, util."""
+        d = self.daily.sort_index()
+        return pd.DataFrame({"date": d.index, "util": (d["booked"] / d["slots"]).to_numpy()})
+
+
+def partial_from_chunks(chunks, clean: bool = True) -> KpiPartial:
+    """
+    Fold an iterable of tee-time chunks (raw unless clean=False) into one KpiPartial.
+
+    Raw chunks are cleaned one at a time, so missing prices get per-chunk medians (see module docstring).
+    """
+    part = KpiPartial()
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        part.update(clean_teetimes(chunk) if clean else chunk)
+    return part
+
+
+def course_partial(course_id: str, chunksize: int = 50_000) -> KpiPartial:
+    return partial_from_chunks(iter_teetimes(course_id, chunksize=chunksize))
+
+
+def streaming_kpis(course_ids, chunksize: int = 50_000, workers: int | None = None):
+    """
+    KPIs over many saved courses, one worker process per course.
+
+    Returns ({course_id: KpiPartial}, combined KpiPartial).
+    """
+    course_ids = list(course_ids)
+    if workers == 1 or len(course_ids) <= 1:
+        parts = [course_partial(c, chunksize) for c in course_ids]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(course_partial, course_ids, [chunksize] * len(course_ids)))
+    return dict(zip(course_ids, parts)), reduce(KpiPartial.merge, parts, KpiPartial())
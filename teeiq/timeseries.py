@@ -0,0 +1,144 @@
+"""
+Incremental daily time series: rolling 7/28/365-day utilization, revenue and booking pace.
+
+DailySeries keeps per-calendar-day totals (missing days count as zero) plus running
+cumulative sums, so appending or re-uploading the latest days only touches those days
+and any rolling window is a difference of two cumulative sums.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["slots", "booked", "revenue"]
+WINDOWS = (7, 28, 365)
+# 52 weeks back lands on the same weekday.
+YOY_LAG_DAYS = 364
+
+
+class DailySeries:
+    def __init__(self):
+        self.start: date | None = None
+        self._n = 0
+        self._data = np.zeros((0, len(COLUMNS)))
+        self._cum = np.zeros((1, len(COLUMNS)))
+
+    def __len__(self):
+        return self._n
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DailySeries":
+        return cls().update_from_frame(df)
+
+    @classmethod
+    def from_daily(cls, daily: pd.DataFrame) -> "DailySeries":
+        """From a date-indexed slots/booked/revenue table, e.g. streaming.KpiPartial.daily."""
+        return cls().update(daily)
+
+    @property
+    def end(self) -> date | None:
+        return None if self.start is None else self.start + timedelta(days=self._n - 1)
+
+    def update_from_frame(self, df: pd.DataFrame) -> "DailySeries":
+        """Fold cleaned tee times for new (or re-uploaded) days; cost scales with those rows only."""
+        booked = df["booked"].astype(bool)
+        day = pd.DataFrame({
+            "date": df["date"],
+            "slots": 1,
+            "booked": booked.astype(int),
+            "revenue": df["price"].where(booked, 0.0),
+        })
+        return self.update(day.groupby("date").sum())
+
+    def update(self, daily: pd.DataFrame) -> "DailySeries":
+        """Set totals for the given days (replacing any already present) and extend the cumulative sums."""
+        if daily.empty:
+            return self
+        days = pd.to_datetime(pd.Index(daily.index)).date
+        first_day = min(days)
+        if self.start is None:
+            self.start = first_day
+        elif first_day < self.start:
+            # Back-filled history before our start: rebuild once on the wider range.
+            shift = (self.start - first_day).days
+            self._data = np.vstack([np.zeros((shift, len(COLUMNS))), self._data[: self._n]])
+            self._n += shift
+            self.start = first_day
+            self._cum = np.zeros((len(self._data) + 1, len(COLUMNS)))
+            self._cum[1:] = np.cumsum(self._data, axis=0)
+
+        offsets = np.array([(d - self.start).days for d in days])
+        n = max(self._n, int(offsets.max()) + 1)
+        self._reserve(n)
+        self._data[self._n:n] = 0.0
+        self._data[offsets] = daily[COLUMNS].to_numpy(dtype=float)
+
+        lo = min(int(offsets.min()), self._n)
+        self._cum[lo + 1:n + 1] = self._cum[lo] + np.cumsum(self._data[lo:n], axis=0)
+        self._n = n
+        return self
+
+    def _reserve(self, n: int):
+        if n <= len(self._data):
+            return
+        cap = max(n, 2 * len(self._data), 64)
+        data = np.zeros((cap, len(COLUMNS)))
+        data[: self._n] = self._data[: self._n]
+        cum = np.zeros((cap + 1, len(COLUMNS)))
+        cum[: self._n + 1] = self._cum[: self._n + 1]
+        self._data, self._cum = data, cum
+
+    def window(self, days: int, end_offset: int | None = None) -> dict:
+        """Totals for the `days`-day window ending at day `end_offset` (default: latest)."""
+        i = self._n - 1 if end_offset is None else end_offset
+        if i < 0:
+            return {"slots": 0.0, "booked": 0.0, "revenue": 0.0, "util": np.nan, "pace": np.nan}
+        slots, booked, revenue = self._cum[i + 1] - self._cum[max(0, i + 1 - days)]
+        return {
+            "slots": slots,
+            "booked": booked,
+            "revenue": revenue,
+            "util": booked / slots if slots else np.nan,
+            "pace": booked / min(days, i + 1),
+        }
+
+    def rolling(self, days: int) -> pd.DataFrame:
+        """Full rolling series: date, slots, booked, revenue, util, pace (bookings/day)."""
+        idx = np.arange(self._n)
+        lo = np.maximum(0, idx + 1 - days)
+        sums = self._cum[idx + 1] - self._cum[lo]
+        out = pd.DataFrame(sums, columns=COLUMNS)
+        out.insert(0, "date", [self.start + timedelta(days=int(i)) for i in idx] if self._n else [])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["util"] = np.where(out["slots"] > 0, out["booked"] / out["slots"], np.nan)
+        out["pace"] = out["booked"] / (idx - lo + 1)
+        return out
+
+    def daily_utilization(self) -> pd.DataFrame:
+        """Same shape as analytics.daily_utilization (days without tee times are skipped)."""
+        r = self.rolling(1)
+        return r.loc[r["slots"] > 0, ["date", "util"]].reset_index(drop=True)
+
+    def summary(self) -> dict:
+        """Latest rolling windows plus week-over-week and year-over-year (same weekdays) changes."""
+        out = {}
+        for w in WINDOWS:
+            cur = self.window(w)
+            out[f"util_{w}d"] = cur["util"]
+            out[f"revenue_{w}d"] = cur["revenue"]
+            out[f"pace_{w}d"] = cur["pace"]
+
+        last = self._n - 1
+        this_week = self.window(7)
+        prev_week = self.window(7, last - 7) if last >= 13 else None
+        out["wow_util_pts"] = (this_week["util"] - prev_week["util"]) * 100 if prev_week else np.nan
+        last_year = self.window(7, last - YOY_LAG_DAYS) if last - YOY_LAG_DAYS >= 6 else None
+        if last_year and last_year["slots"]:
+            out["yoy_util_pts"] = (this_week["util"] - last_year["util"]) * 100
+            out["yoy_revenue_pct"] = (
+                (this_week["revenue"] / last_year["revenue"] - 1) * 100 if last_year["revenue"] else np.nan
+            )
+        else:
+            out["yoy_util_pts"] = np.nan
+            out["yoy_revenue_pct"] = np.nan
+        return out
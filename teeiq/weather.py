@@ -1,4 +1,4 @@
-import requests
+from functools import lru_cache
 import pandas as pd
 
 OPEN_METEO = "https://api.open-meteo.com/v1/forecast"
@@ -12,6 +12,8 @@ def fetch_daily_weather(lat: float, lon: float, start: str, end: str) -> pd.Data
         "daily": ["temperature_2m_max","temperature_2m_min","precipitation_sum","windspeed_10m_max"],
         "timezone": "auto",
     }
+    import requests
+
     r = requests.get(OPEN_METEO, params=params, timeout=20)
     r.raise_for_status()
     js = r.json()
@@ -21,3 +23,12 @@ def fetch_daily_weather(lat: float, lon: float, start: str, end: str) -> pd.Data
         df.rename(columns={"time": "date"}, inplace=True)
         df["date"] = pd.to_datetime(df["date"]).dt.date
     return df
+
+
+@lru_cache(maxsize=128)
+def _cached_daily_weather(lat: float, lon: float, start: str, end: str) -> pd.DataFrame:
+    return fetch_daily_weather(lat, lon, start, end)
+
+def cached_daily_weather(lat: float, lon: float, start: str, end: str) -> pd.DataFrame:
+    """fetch_daily_weather() memoized per (rounded) location and date range; returns a copy."""
+    return _cached_daily_weather(round(lat, 3), round(lon, 3), start, end).copy()
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from teeiq.data_utils import clean_teetimes
+from teeiq.demo import make_demo_teetimes
+from teeiq.pricing import DEFAULT_ELASTICITY, PRICE_MOMENTS, add_price_moments, elasticity_from_moments
+from teeiq.recs import low_fill_opportunities
+
+
+def test_underfilled_demo_slot_gets_a_discount():
+    df = clean_teetimes(make_demo_teetimes())
+    # Leave Tuesday 1 PM a quarter full so it is clearly under-filled
+    quiet = (df["weekday"] == "Tuesday") & (df["hour"] == 13)
+    df.loc[quiet, "booked"] = np.arange(quiet.sum()) % 4 == 0
+
+    opp = low_fill_opportunities(df, slot_minutes=60)
+    row = opp[(opp["weekday"] == "Tuesday") & (opp["hour"] == 13)].iloc[0]
+    assert row["util"] == 0.25
+    assert row["suggested_discount"] > 0
+    assert row["new_price"] < row["avg_price"]
+    assert row["est_monthly_lift"] > 0
+
+
+def test_price_noise_does_not_look_inelastic():
+    # Demo prices carry only a few percent of noise, so slots lean on DEFAULT_ELASTICITY
+    df = add_price_moments(clean_teetimes(make_demo_teetimes()))
+    g = df.groupby(["weekday", "hour"], observed=True)[PRICE_MOMENTS].sum()
+    elasticity = elasticity_from_moments(g)
+    assert (elasticity < -1).all()
+    assert np.median(elasticity) == DEFAULT_ELASTICITY
+
+
+def test_elastic_history_is_recovered():
+    rng = np.random.default_rng(1)
+    price = np.exp(rng.normal(np.log(60), 0.25, 20_000))
+    booked = rng.random(len(price)) < np.clip(0.5 * (price / 60) ** -2.0, 0, 1)
+    g = add_price_moments(pd.DataFrame({"price": price, "booked": booked}))[PRICE_MOMENTS].sum().to_frame().T
+    assert -2.5 < elasticity_from_moments(g)[0] < -1.5